@@ -2,173 +2,57 @@
 
 __version__ = "0.4.1"
 
+import importlib
 import logging
-from pathlib import Path
+from typing import TYPE_CHECKING
 
 # Configure library logger - users can adjust level via logging.getLogger("jedidb")
 logger = logging.getLogger("jedidb")
 logger.addHandler(logging.NullHandler())
 
-from jedidb.core.database import Database
-from jedidb.core.indexer import Indexer
-from jedidb.core.search import SearchEngine
-from jedidb.core.analyzer import Analyzer
-from jedidb.core.models import (
-    FileRecord,
-    Definition,
-    Reference,
-    Import,
-    Decorator,
-    ClassBase,
-    SearchResult,
-)
-from jedidb.config import Config
-
-
-class JediDB:
-    """Main interface for the JediDB code analyzer."""
-
-    def __init__(self, source: Path | str, index: Path | str, resolve_refs: bool = True, base_classes: bool = True):
-        """Initialize JediDB for a project.
-
-        Args:
-            source: Source code directory
-            index: Index directory (where jedidb data lives)
-            resolve_refs: Whether to resolve reference targets (enables call graph)
-            base_classes: Whether to track class inheritance (base classes)
-        """
-        self.source = Path(source).resolve()
-        self.index = Path(index).resolve()
-        self.db_dir = self.index / "db"
-        self._resolve_refs = resolve_refs
-        self._base_classes = base_classes
-
-        self.config = Config.load(self.index)
-
-        # Prefer parquet if available, otherwise create in-memory DuckDB
-        if (self.db_dir / "definitions.parquet").exists():
-            self.db = Database.open_parquet(self.db_dir)
-        else:
-            self.db_dir.mkdir(parents=True, exist_ok=True)
-            self.db = Database(":memory:")
-
-        self.analyzer = Analyzer(self.source, base_classes=base_classes)
-        self.indexer = Indexer(self.db, self.analyzer, resolve_refs=resolve_refs)
-        self.search_engine = SearchEngine(self.db)
-
-    def index_files(
-        self,
-        paths: list[str] | None = None,
-        include: list[str] | None = None,
-        exclude: list[str] | None = None,
-        force: bool = False,
-    ) -> dict:
-        """Index Python files in the project.
-
-        Patterns from config.toml are merged with explicit include/exclude args.
-
-        Args:
-            paths: Specific paths to index. If None, indexes source root.
-            include: Glob patterns to include (e.g., ["src/**/*.py"])
-            exclude: Glob patterns to exclude (e.g., ["**/test_*.py"])
-            force: Force re-indexing even if files haven't changed
-
-        Returns:
-            Dictionary with indexing statistics
-        """
-        # Merge caller-provided patterns with config patterns
-        all_include = list(include or []) + self.config.include_patterns
-        all_exclude = list(exclude or []) + self.config.exclude_patterns
-
-        stats = self.indexer.index(
-            paths=paths,
-            include=all_include if all_include else None,
-            exclude=all_exclude if all_exclude else None,
-            force=force,
-        )
-
-        # Always export to parquet (this is now the primary storage format)
-        if stats["files_indexed"] > 0 or stats["files_removed"] > 0:
-            self.db.export_to_parquet(self.db_dir)
-            stats["packed"] = True
-            stats["parquet_size"] = sum(
-                f.stat().st_size
-                for f in self.db_dir.iterdir()
-                if f.suffix == ".parquet"
-            )
-
-        return stats
-
-    def search(
-        self,
-        query: str,
-        type: str | None = None,
-        limit: int = 20,
-    ) -> list[SearchResult]:
-        """Full-text search definitions.
-
-        Args:
-            query: Search query string
-            type: Filter by definition type (function, class, variable, etc.)
-            limit: Maximum number of results
-
-        Returns:
-            List of SearchResult objects
-        """
-        return self.search_engine.search(query, type=type, limit=limit)
-
-    def get_definition(self, name: str) -> Definition | None:
-        """Get a definition by its full name.
-
-        Args:
-            name: Fully qualified name (e.g., "mymodule.MyClass.method")
-
-        Returns:
-            Definition object or None if not found
-        """
-        return self.search_engine.get_definition(name)
-
-    def references(self, name: str) -> list[Reference]:
-        """Find all references to a definition.
-
-        Args:
-            name: Name to find references for
-
-        Returns:
-            List of Reference objects
-        """
-        return self.search_engine.find_references(name)
-
-    def query(self, sql: str) -> list[dict]:
-        """Execute a raw SQL query.
-
-        Args:
-            sql: SQL query string
-
-        Returns:
-            List of result dictionaries
-        """
-        result = self.db.execute(sql)
-        columns = [desc[0] for desc in result.description] if result.description else []
-        return [dict(zip(columns, row)) for row in result.fetchall()]
-
-    def stats(self) -> dict:
-        """Get database statistics.
-
-        Returns:
-            Dictionary with counts and other statistics
-        """
-        return self.db.get_stats()
-
-    def close(self):
-        """Close the database connection."""
-        self.db.close()
-
-    def __enter__(self):
-        return self
-
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        self.close()
+if TYPE_CHECKING:
+    from jedidb.api import JediDB
+    from jedidb.config import Config
+    from jedidb.core.analyzer import Analyzer
+    from jedidb.core.database import Database
+    from jedidb.core.indexer import Indexer
+    from jedidb.core.models import (
+        ClassBase,
+        Decorator,
+        Definition,
+        FileRecord,
+        Import,
+        Reference,
+        SearchResult,
+    )
+    from jedidb.core.search import SearchEngine
+
+# Public names are loaded on first access: DuckDB is only imported once the
+# database is needed, and Jedi (via Analyzer and Indexer) only for indexing.
+# This keeps 'import jedidb' and the CLI's --help cheap.
+_LAZY_IMPORTS = {
+    "JediDB": "jedidb.api",
+    "Database": "jedidb.core.database",
+    "SearchEngine": "jedidb.core.search",
+    "Analyzer": "jedidb.core.analyzer",
+    "Indexer": "jedidb.core.indexer",
+    "Config": "jedidb.config",
+    "FileRecord": "jedidb.core.models",
+    "Definition": "jedidb.core.models",
+    "Reference": "jedidb.core.models",
+    "Import": "jedidb.core.models",
+    "Decorator": "jedidb.core.models",
+    "ClassBase": "jedidb.core.models",
+    "SearchResult": "jedidb.core.models",
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_IMPORTS:
+        value = getattr(importlib.import_module(_LAZY_IMPORTS[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 __all__ = [
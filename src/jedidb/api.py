@@ -0,0 +1,306 @@
+"""JediDB facade: the main entry point for indexing and querying a project."""
+
+import logging
+import os
+from functools import cached_property
+from pathlib import Path
+from typing import TYPE_CHECKING
+from weakref import WeakKeyDictionary, WeakValueDictionary
+
+import duckdb
+
+from jedidb.config import Config
+from jedidb.core.database import Database
+from jedidb.core.models import Definition, Reference, SearchResult
+from jedidb.core.search import SearchEngine
+from jedidb.utils import diff_file_hashes, discover_files, normalize_paths
+
+if TYPE_CHECKING:
+    from jedidb.core.analyzer import Analyzer
+    from jedidb.core.indexer import Indexer
+
+logger = logging.getLogger("jedidb")
+
+
+# Databases shared by live JediDB instances, keyed by (db_dir,
+# definitions.parquet mtime, read-only) so a re-index never serves stale data
+# and read-only connections are never handed to writers.
+_DB_CACHE: WeakValueDictionary[tuple[Path, int, bool], Database] = WeakValueDictionary()
+_DB_USERS: WeakKeyDictionary[Database, int] = WeakKeyDictionary()
+
+
+def _cache_key(db_dir: Path, readonly: bool = False) -> tuple[Path, int, bool]:
+    return (db_dir, (db_dir / "definitions.parquet").stat().st_mtime_ns, readonly)
+
+
+def _native_file(db_dir: Path) -> Path:
+    """Native DuckDB snapshot written alongside the parquet files."""
+    return db_dir / "jedidb.duckdb"
+
+
+def _native_is_current(db_dir: Path) -> bool:
+    """Whether the native snapshot exists and is no older than the parquet files."""
+    try:
+        native_mtime = os.stat(_native_file(db_dir)).st_mtime_ns
+    except FileNotFoundError:
+        return False
+    return native_mtime >= os.stat(db_dir / "definitions.parquet").st_mtime_ns
+
+
+def _open_database(db_dir: Path, readonly: bool) -> Database:
+    """Open db_dir from its native snapshot if current, otherwise from parquet.
+
+    Read-only opens connect to the snapshot file directly; writable opens
+    copy it into memory.
+    """
+    if _native_is_current(db_dir):
+        try:
+            if readonly:
+                return Database.open_readonly(_native_file(db_dir))
+            return Database.open_native(_native_file(db_dir))
+        except duckdb.Error as e:
+            logger.debug("Native snapshot unreadable, loading parquet: %s", e)
+    return Database.open_parquet(db_dir)
+
+
+def _acquire_database(db_dir: Path, readonly: bool = False) -> Database:
+    """Open the database in db_dir, reusing a live instance if unchanged."""
+    key = _cache_key(db_dir, readonly)
+    db = _DB_CACHE.get(key)
+    if db is None or db._conn is None:
+        db = _open_database(db_dir, readonly)
+        _DB_CACHE[key] = db
+    _DB_USERS[db] = _DB_USERS.get(db, 0) + 1
+    return db
+
+
+def _release_database(db: Database):
+    """Drop one user of db, closing the connection when no users remain."""
+    remaining = _DB_USERS.get(db, 1) - 1
+    if remaining > 0:
+        _DB_USERS[db] = remaining
+        return
+    _DB_USERS.pop(db, None)
+    db.close()
+
+
+class JediDB:
+    """Main interface for the JediDB code analyzer."""
+
+    def __init__(
+        self,
+        source: Path | str,
+        index: Path | str,
+        resolve_refs: bool = True,
+        base_classes: bool = True,
+        readonly: bool = False,
+    ):
+        """Initialize JediDB for a project.
+
+        Args:
+            source: Source code directory
+            index: Index directory (where jedidb data lives)
+            resolve_refs: Whether to resolve reference targets (enables call graph)
+            base_classes: Whether to track class inheritance (base classes)
+            readonly: Only wire up the database and search engine (no indexing)
+        """
+        self.source = Path(source).resolve()
+        self.index = Path(index).resolve()
+        self.db_dir = self.index / "db"
+        self._resolve_refs = resolve_refs
+        self._base_classes = base_classes
+        self._readonly = readonly
+
+        self.config = Config.load(self.index)
+
+        # Prefer parquet if available, otherwise create in-memory DuckDB
+        if os.path.exists(self.db_dir / "definitions.parquet"):
+            self.db = _acquire_database(self.db_dir, readonly)
+        else:
+            if not readonly:
+                self.db_dir.mkdir(parents=True, exist_ok=True)
+            self.db = Database(":memory:")
+            _DB_USERS[self.db] = 1
+
+        self.search_engine = SearchEngine(self.db)
+
+    @classmethod
+    def open_readonly(cls, source: Path | str, index: Path | str) -> "JediDB":
+        """Open an existing index for querying only.
+
+        The analyzer and indexer (and with them Jedi) are never constructed,
+        and a current native snapshot is opened read-only in place, so
+        concurrent processes share its pages instead of each loading a copy.
+        """
+        return cls(source, index, readonly=True)
+
+    @cached_property
+    def analyzer(self) -> "Analyzer":
+        """Jedi analyzer, created on first use."""
+        from jedidb.core.analyzer import Analyzer
+
+        return Analyzer(self.source, base_classes=self._base_classes)
+
+    @cached_property
+    def indexer(self) -> "Indexer":
+        """File indexer, created on first use."""
+        if self._readonly:
+            raise RuntimeError("JediDB was opened read-only")
+
+        from jedidb.core.indexer import Indexer
+
+        return Indexer(self.db, self.analyzer, resolve_refs=self._resolve_refs)
+
+    def index_files(
+        self,
+        paths: list[str] | None = None,
+        include: list[str] | None = None,
+        exclude: list[str] | None = None,
+        force: bool = False,
+        files: list[Path] | None = None,
+    ) -> dict:
+        """Index Python files in the project.
+
+        Patterns from config.toml are merged with explicit include/exclude args.
+
+        Args:
+            paths: Specific paths to index. If None, indexes source root.
+            include: Glob patterns to include (e.g., ["src/**/*.py"])
+            exclude: Glob patterns to exclude (e.g., ["**/test_*.py"])
+            force: Force re-indexing even if files haven't changed
+            files: Files already discovered with the merged patterns; when
+                given, discovery is skipped
+
+        Returns:
+            Dictionary with indexing statistics
+        """
+        # Merge caller-provided patterns with config patterns
+        all_include = list(include or []) + self.config.include_patterns
+        all_exclude = list(exclude or []) + self.config.exclude_patterns
+
+        stats = self.indexer.index(
+            paths=paths,
+            include=all_include if all_include else None,
+            exclude=all_exclude if all_exclude else None,
+            force=force,
+            files=files,
+        )
+
+        # Always export to parquet (this is now the primary storage format)
+        if stats["files_indexed"] > 0 or stats["files_removed"] > 0:
+            self.save()
+            stats["packed"] = True
+            # os.scandir avoids building a Path per entry; DirEntry caches its stat
+            with os.scandir(self.db_dir) as entries:
+                stats["parquet_size"] = sum(
+                    e.stat().st_size for e in entries if e.name.endswith(".parquet")
+                )
+            # The native snapshot is usually far larger than the parquet files
+            stats["snapshot_size"] = os.path.getsize(_native_file(self.db_dir))
+        elif (
+            os.path.exists(self.db_dir / "definitions.parquet")
+            and not _native_is_current(self.db_dir)
+        ):
+            # Indexes written before native snapshots existed get one on next run
+            self.db.write_native(_native_file(self.db_dir))
+
+        return stats
+
+    def check_staleness(
+        self,
+        paths: list[str] | None = None,
+        include: list[str] | None = None,
+        exclude: list[str] | None = None,
+    ) -> dict:
+        """Check whether the index is stale without indexing.
+
+        Only the recorded file hashes are read, so this works on a read-only
+        instance and never loads Jedi. Patterns from config.toml are merged
+        with explicit include/exclude args.
+
+        Returns:
+            Dictionary with is_stale and the changed, added and removed paths
+        """
+        all_include = list(include or []) + self.config.include_patterns
+        all_exclude = list(exclude or []) + self.config.exclude_patterns
+
+        disk_files = discover_files(paths, all_include or None, all_exclude or None, self.source)
+        indexed = dict(self.db.execute("SELECT path, hash FROM files").fetchall())
+        return diff_file_hashes(indexed, disk_files, normalize_paths(disk_files, self.source))
+
+    def save(self):
+        """Write the database to parquet files and the native DuckDB snapshot."""
+        self.db.export_to_parquet(self.db_dir)
+        self.db.write_native(_native_file(self.db_dir))
+        _DB_CACHE[_cache_key(self.db_dir)] = self.db
+
+    def search(
+        self,
+        query: str,
+        type: str | None = None,
+        limit: int = 20,
+    ) -> list[SearchResult]:
+        """Full-text search definitions.
+
+        Args:
+            query: Search query string
+            type: Filter by definition type (function, class, variable, etc.)
+            limit: Maximum number of results
+
+        Returns:
+            List of SearchResult objects
+        """
+        return self.search_engine.search(query, type=type, limit=limit)
+
+    def get_definition(self, name: str) -> Definition | None:
+        """Get a definition by its full name.
+
+        Args:
+            name: Fully qualified name (e.g., "mymodule.MyClass.method")
+
+        Returns:
+            Definition object or None if not found
+        """
+        return self.search_engine.get_definition(name)
+
+    def references(self, name: str) -> list[Reference]:
+        """Find all references to a definition.
+
+        Args:
+            name: Name to find references for
+
+        Returns:
+            List of Reference objects
+        """
+        return self.search_engine.find_references(name)
+
+    def query(self, sql: str) -> list[dict]:
+        """Execute a raw SQL query.
+
+        Args:
+            sql: SQL query string
+
+        Returns:
+            List of result dictionaries
+        """
+        result = self.db.execute(sql)
+        columns = [desc[0] for desc in result.description] if result.description else []
+        return [dict(zip(columns, row)) for row in result.fetchall()]
+
+    def stats(self) -> dict:
+        """Get database statistics.
+
+        Returns:
+            Dictionary with counts and other statistics
+        """
+        return self.db.get_stats()
+
+    def close(self):
+        """Close the database connection (shared connections close with their last user)."""
+        _release_database(self.db)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -1,17 +1,51 @@
 """Main Typer application for JediDB CLI."""
 
-from importlib.resources import files
+import importlib
+import os
 from pathlib import Path
 from typing import Optional
 
 import typer
-
-from jedidb.cli.commands import init, index, search, query, show, export, stats, clean, calls, source, inheritance
+from typer.core import TyperCommand, TyperGroup
+
+
+# Subcommands in help order. Each lives in jedidb.cli.commands.<name> as
+# <name>_cmd and is only imported when it is invoked (or listed by --help).
+COMMANDS = [
+    "init",
+    "index",
+    "search",
+    "query",
+    "show",
+    "export",
+    "stats",
+    "clean",
+    "calls",
+    "source",
+    "inheritance",
+    "serve",
+]
+
+
+class LazyGroup(TyperGroup):
+    """Typer group that imports subcommand modules on first use."""
+
+    def list_commands(self, ctx: typer.Context) -> list[str]:
+        return COMMANDS
+
+    def get_command(self, ctx: typer.Context, cmd_name: str) -> TyperCommand | None:
+        if cmd_name not in self.commands and cmd_name in COMMANDS:
+            module = importlib.import_module(f"jedidb.cli.commands.{cmd_name}")
+            sub_app = typer.Typer(add_completion=False, rich_markup_mode=None)
+            sub_app.command(name=cmd_name)(getattr(module, f"{cmd_name}_cmd"))
+            self.add_command(typer.main.get_command(sub_app), cmd_name)
+        return self.commands.get(cmd_name)
 
 
 app = typer.Typer(
     name="jedidb",
     help="Jedi code analyzer with DuckDB storage and full-text search.",
+    cls=LazyGroup,
     add_completion=False,
     rich_markup_mode=None,
     pretty_exceptions_enable=False,
@@ -40,6 +74,8 @@ def main_callback(
 ):
     """Jedi code analyzer with DuckDB storage and full-text search."""
     if readme:
+        from importlib.resources import files
+
         try:
             readme_text = files("jedidb").joinpath("README.md").read_text()
             print(readme_text)
@@ -60,26 +96,15 @@ def main_callback(
 
     ctx.ensure_object(dict)
 
-    source_path = (source or Path.cwd()).resolve()
-    index_path = (index_dir or source_path / ".jedidb").resolve()
+    # abspath is pure string work; symlinks are resolved once, by JediDB,
+    # only for commands that open the index
+    source_path = Path(os.path.abspath(source or os.curdir))
+    index_path = Path(os.path.abspath(index_dir)) if index_dir else source_path / ".jedidb"
 
     ctx.obj["source"] = source_path
     ctx.obj["index"] = index_path
 
 
-app.command(name="init")(init.init_cmd)
-app.command(name="index")(index.index_cmd)
-app.command(name="search")(search.search_cmd)
-app.command(name="query")(query.query_cmd)
-app.command(name="show")(show.show_cmd)
-app.command(name="export")(export.export_cmd)
-app.command(name="stats")(stats.stats_cmd)
-app.command(name="clean")(clean.clean_cmd)
-app.command(name="calls")(calls.calls_cmd)
-app.command(name="source")(source.source_cmd)
-app.command(name="inheritance")(inheritance.inheritance_cmd)
-
-
 def main():
     """Entry point for the CLI."""
     app()
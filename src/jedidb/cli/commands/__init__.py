@@ -1,3 +1 @@
-"""CLI commands for JediDB."""
-
-from jedidb.cli.commands import calls, source, inheritance
+"""CLI commands for JediDB (imported on demand by jedidb.cli.app)."""
@@ -1,11 +1,11 @@
 """Calls command for JediDB CLI."""
 
+import os
 from pathlib import Path
 from typing import Optional
 
 import typer
 
-from jedidb import JediDB
 from jedidb.cli.formatters import (
     get_source_path,
     get_index_path,
@@ -16,9 +16,59 @@ from jedidb.cli.formatters import (
     OutputFormat,
     print_error,
     print_info,
+    print_success,
 )
 
 
+# Every call edge reachable from one function within a depth bound, in a
+# single statement. Parameters are named and typed so the same query binds
+# identically whether run directly or wrapped in COPY.
+# Duplicates from refs matching multiple enclosing definitions are collapsed
+# by grouping on the call site, and only for the rows returned.
+CALLS_QUERY = """
+    WITH RECURSIVE reach(name, level) AS (
+        SELECT $root::VARCHAR, 1
+        UNION
+        SELECT c.callee_full_name, r.level + 1
+        FROM reach r
+        JOIN calls c ON c.caller_full_name = r.name
+        WHERE r.level < $depth::INTEGER AND c.callee_full_name IS NOT NULL
+            AND (NOT $top_level::BOOLEAN OR c.call_depth = 1)
+    )
+    SELECT
+        caller_full_name,
+        callee_full_name,
+        callee_name,
+        line,
+        col,
+        ANY_VALUE(context) AS context,
+        call_order,
+        MIN(call_depth) AS call_depth
+    FROM calls
+    WHERE caller_full_name IN (SELECT name FROM reach)
+        AND (NOT $top_level::BOOLEAN OR call_depth = 1)
+    GROUP BY caller_full_name, callee_full_name, callee_name, line, col, call_order
+    ORDER BY caller_full_name, call_order
+"""
+
+
+# Keys for each call dict, in the column order of the calls query (after caller_full_name)
+_CALL_FIELDS = (
+    "callee_full_name",
+    "callee_name",
+    "line",
+    "col",
+    "context",
+    "call_order",
+    "call_depth",
+)
+
+# Row templates for format_calls_table; %-formatting a fixed template is
+# cheaper per row than an f-string with several format specs.
+_CALLS_ROW_DEPTH = "%5s %5s  %-40s %6s  %s"
+_CALLS_ROW = "%5s  %-40s %6s  %s"
+
+
 def format_calls_table(calls: list[dict], show_depth: bool = False) -> str:
     """Format calls as a plain text table."""
     if not calls:
@@ -29,42 +79,60 @@ def format_calls_table(calls: list[dict], show_depth: bool = False) -> str:
         lines.append(f"{'Order':>5} {'Depth':>5}  {'Callee':<40} {'Line':>6}  {'Context'}")
         lines.append("-" * 100)
         for c in calls:
-            callee = c.get("callee_full_name") or c.get("callee_name", "")
-            lines.append(
-                f"{c.get('call_order', 0):>5} {c.get('call_depth', 0):>5}  "
-                f"{callee:<40} {c.get('line', 0):>6}  {c.get('context', '')[:50]}"
-            )
+            get = c.get
+            lines.append(_CALLS_ROW_DEPTH % (
+                get("call_order", 0),
+                get("call_depth", 0),
+                get("callee_full_name") or get("callee_name", ""),
+                get("line", 0),
+                (get("context") or "")[:50],
+            ))
     else:
         lines.append(f"{'Order':>5}  {'Callee':<40} {'Line':>6}  {'Context'}")
         lines.append("-" * 95)
         for c in calls:
-            callee = c.get("callee_full_name") or c.get("callee_name", "")
-            lines.append(
-                f"{c.get('call_order', 0):>5}  "
-                f"{callee:<40} {c.get('line', 0):>6}  {c.get('context', '')[:50]}"
-            )
+            get = c.get
+            lines.append(_CALLS_ROW % (
+                get("call_order", 0),
+                get("callee_full_name") or get("callee_name", ""),
+                get("line", 0),
+                (get("context") or "")[:50],
+            ))
 
     return "\n".join(lines)
 
 
 def format_calls_tree(calls: list[dict], depth: int = 0, prefix: str = "") -> str:
-    """Format calls as an indented tree."""
+    """Format calls as an indented tree.
+
+    depth is accepted for compatibility and unused: nesting is tracked while
+    walking the tree, and prefix alone sets the starting indentation.
+    """
     if not calls:
         return "No calls found."
 
+    # Walk the tree with an explicit stack so each line is built once and
+    # joined once, rather than re-joining every nested level
     lines = []
-    for i, c in enumerate(calls):
-        is_last = i == len(calls) - 1
+    stack = []
+
+    def push_children(nodes: list[dict], node_prefix: str):
+        # Push in reverse so the first child is popped first
+        last = len(nodes) - 1
+        for i in range(last, -1, -1):
+            stack.append((nodes[i], i == last, node_prefix))
+
+    push_children(calls, prefix)
+    while stack:
+        c, is_last, node_prefix = stack.pop()
         callee = c.get("callee_full_name") or c.get("callee_name", "")
         connector = "`-- " if is_last else "|-- "
-        lines.append(f"{prefix}{connector}{callee} (line {c.get('line', 0)})")
+        lines.append(f"{node_prefix}{connector}{callee} (line {c.get('line', 0)})")
 
         # If there are nested calls, show them
-        nested = c.get("nested_calls", [])
+        nested = c.get("nested_calls")
         if nested:
-            extension = "    " if is_last else "|   "
-            nested_output = format_calls_tree(nested, depth + 1, prefix + extension)
-            lines.append(nested_output)
+            push_children(nested, node_prefix + ("    " if is_last else "|   "))
 
     return "\n".join(lines)
 
@@ -124,13 +192,15 @@ def calls_cmd(
 
         jedidb calls parse -o calls.json     # output to file
     """
+    from jedidb import JediDB
+
     output_format = resolve_output_format(output_format, output)
 
     source = get_source_path(ctx)
     index = get_index_path(ctx)
 
     try:
-        jedidb = JediDB(source=source, index=index)
+        jedidb = JediDB.open_readonly(source=source, index=index)
     except Exception as e:
         print_error(f"Failed to open database: {e}")
         raise typer.Exit(1)
@@ -147,8 +217,52 @@ def calls_cmd(
             print_error(f"'{name}' is a {definition.type}, not a function or class")
             raise typer.Exit(1)
 
-        # Build query for calls
-        depth_filter = "AND call_depth = 1" if top_level else ""
+        params = {"root": definition.full_name, "depth": depth, "top_level": top_level}
+
+        # Flat JSON/JSONL to a file needs no nesting: let DuckDB stream it
+        # to disk directly instead of building a dict per call
+        flat_json = output_format == OutputFormat.json or (
+            output_format == OutputFormat.jsonl and not tree
+        )
+        if output and flat_json and depth == 1:
+            if output_format == OutputFormat.json:
+                copy_options = "FORMAT JSON, ARRAY true"
+            else:
+                copy_options = "FORMAT JSON"
+            # COPY into a temporary file beside the output and move it into
+            # place only if there are rows, so an existing file is never
+            # truncated or removed for an empty result
+            tmp = output.with_name(f".{output.name}.{os.getpid()}.tmp")
+            safe_path = str(tmp).replace("'", "''")
+            try:
+                copied = jedidb.db.execute(
+                    f"""
+                    COPY (
+                        SELECT {", ".join(_CALL_FIELDS)} FROM ({CALLS_QUERY}) ORDER BY call_order
+                    ) TO '{safe_path}' ({copy_options})
+                    """,
+                    params,
+                ).fetchone()[0]
+                if copied:
+                    os.replace(tmp, output)
+            except Exception as e:
+                print_error(f"Failed to write {output}: {e}")
+                raise typer.Exit(1)
+            finally:
+                tmp.unlink(missing_ok=True)
+            if not copied:
+                print_info(f"No calls found in {definition.full_name}")
+            else:
+                print_success(f"Wrote {copied} row(s) to {output}")
+            raise typer.Exit(0)
+
+        # Fetch every call edge reachable within --depth in one round-trip,
+        # then rebuild the nested shape in Python.
+        results = jedidb.db.execute(CALLS_QUERY, params).fetchall()
+
+        calls_by_caller: dict[str, list[tuple]] = {}
+        for r in results:
+            calls_by_caller.setdefault(r[0], []).append(r)
 
         visited = set()
 
@@ -158,38 +272,13 @@ def calls_cmd(
                 return []
             visited.add(full_name)
 
-            # Use DISTINCT to avoid duplicates from refs matching multiple enclosing definitions
-            query = f"""
-                SELECT DISTINCT
-                    callee_full_name,
-                    callee_name,
-                    line,
-                    col,
-                    context,
-                    call_order,
-                    call_depth
-                FROM calls
-                WHERE caller_full_name = ?
-                {depth_filter}
-                ORDER BY call_order
-            """
-            results = jedidb.db.execute(query, (full_name,)).fetchall()
-
             calls = []
-            for r in results:
-                call = {
-                    "callee_full_name": r[0],
-                    "callee_name": r[1],
-                    "line": r[2],
-                    "col": r[3],
-                    "context": r[4],
-                    "call_order": r[5],
-                    "call_depth": r[6],
-                }
+            for r in calls_by_caller.get(full_name, []):
+                call = dict(zip(_CALL_FIELDS, r[1:]))
 
                 # Recurse if requested and callee is resolved
-                if current_depth < depth and r[0]:
-                    call["nested_calls"] = get_calls_for_function(r[0], current_depth + 1)
+                if current_depth < depth and r[1]:
+                    call["nested_calls"] = get_calls_for_function(r[1], current_depth + 1)
 
                 calls.append(call)
 
@@ -211,6 +300,7 @@ def calls_cmd(
     elif tree:
         content = f"Calls from {definition.full_name}:\n{format_calls_tree(calls)}"
     else:
-        content = f"Calls from {definition.full_name}:\n\n{format_calls_table(calls, show_depth=not top_level)}\n\n{len(calls)} call(s)"
+        table = format_calls_table(calls, show_depth=not top_level)
+        content = f"Calls from {definition.full_name}:\n\n{table}\n\n{len(calls)} call(s)"
 
     write_output(content, output, len(calls))
@@ -1,10 +1,10 @@
 """Clean command for JediDB CLI."""
 
+import os
 import shutil
 
 import typer
 
-from jedidb import JediDB
 from jedidb.cli.formatters import get_source_path, get_index_path, print_success, print_error, print_warning
 
 
@@ -33,6 +33,8 @@ def clean_cmd(
     By default, removes entries for files that no longer exist.
     Use --all to completely reset the database.
     """
+    from jedidb import JediDB
+
     source = get_source_path(ctx)
     index = get_index_path(ctx)
     db_dir = index / "db"
@@ -52,9 +54,10 @@ def clean_cmd(
         print_success("Database reset successfully")
         return
 
-    # For stale cleanup, we need to open the database
+    # For stale cleanup, we need to open the database (read-only until
+    # there is something to delete)
     try:
-        jedidb = JediDB(source=source, index=index)
+        jedidb = JediDB.open_readonly(source=source, index=index)
     except Exception as e:
         print_error(f"Failed to open database: {e}")
         print_error("Try 'jedidb clean --all' to reset the database")
@@ -62,20 +65,34 @@ def clean_cmd(
 
     try:
         if stale:
-            # Find files that no longer exist
-            result = jedidb.db.execute("SELECT id, path FROM files").fetchall()
-            removed = 0
+            # List each indexed directory once; DuckDB does the anti-join
+            # against the files table
+            dirs = jedidb.db.execute("SELECT DISTINCT parse_dirpath(path) FROM files").fetchall()
+            on_disk = []
+            for (dir_name,) in dirs:
+                try:
+                    names = os.listdir(os.path.join(source, dir_name))
+                except (FileNotFoundError, NotADirectoryError):
+                    continue
+                on_disk.extend(os.path.join(dir_name, n) for n in names if n.endswith(".py"))
 
-            for file_id, file_path in result:
-                full_path = source / file_path
-                if not full_path.exists():
-                    jedidb.db.delete_file(file_id)
-                    removed += 1
+            has_stale = jedidb.db.execute(
+                "SELECT COUNT(*) FROM files WHERE path NOT IN (SELECT UNNEST(?::VARCHAR[]))",
+                (on_disk,),
+            ).fetchone()[0] > 0
+
+            removed = 0
+            if has_stale:
+                jedidb.close()
+                jedidb = JediDB(source=source, index=index)
+                with jedidb.db.transaction():
+                    stale_paths = jedidb.db.delete_missing_files(on_disk)
+                for file_path in stale_paths:
                     print(f"Removed: {file_path}")
+                removed = len(stale_paths)
 
-            # Re-export to parquet if we removed anything
-            if removed > 0:
-                jedidb.db.export_to_parquet(jedidb.db_dir)
+                # Re-save parquet files and snapshot
+                jedidb.save()
     finally:
         jedidb.close()
 
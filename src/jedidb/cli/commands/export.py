@@ -1,21 +1,122 @@
 """Export command for JediDB CLI."""
 
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
 from pathlib import Path
 from typing import Optional
 
 import typer
 
-from jedidb import JediDB
 from jedidb.cli.formatters import (
-    get_source_path,
-    get_index_path,
-    format_data_json,
-    format_data_csv,
+    OUTPUT_BUFFER_SIZE,
     get_format_from_extension,
-    write_output,
+    get_index_path,
+    get_source_path,
     print_error,
+    print_success,
+    write_data_csv,
+    write_data_json,
 )
 
+# Export SQL and column names per table, built once at import. The
+# definitions query takes an optional type filter, bound as a parameter.
+_DEFINITIONS_SELECT = """
+    SELECT d.id, d.name, d.full_name, d.type, d.line, d.col as column,
+           d.signature, d.docstring, d.is_public, f.path as file
+    FROM definitions d
+    JOIN files f ON d.file_id = f.id
+"""
+
+EXPORT_QUERIES: dict[str, tuple[str, list[str]]] = {
+    "definitions": (
+        _DEFINITIONS_SELECT + " ORDER BY f.path, d.line",
+        [
+            "id", "name", "full_name", "type", "line", "column",
+            "signature", "docstring", "is_public", "file",
+        ],
+    ),
+    "files": (
+        "SELECT id, path, hash, size, modified_at, indexed_at FROM files ORDER BY path",
+        ["id", "path", "hash", "size", "modified_at", "indexed_at"],
+    ),
+    "refs": (
+        """
+        SELECT r.id, r.name, r.line, r.col as column, r.context, f.path as file
+        FROM refs r
+        JOIN files f ON r.file_id = f.id
+        ORDER BY f.path, r.line
+        """,
+        ["id", "name", "line", "column", "context", "file"],
+    ),
+    "imports": (
+        """
+        SELECT i.id, i.module, i.name, i.alias, i.line, f.path as file
+        FROM imports i
+        JOIN files f ON i.file_id = f.id
+        ORDER BY f.path, i.line
+        """,
+        ["id", "module", "name", "alias", "line", "file"],
+    ),
+}
+
+_DEFINITIONS_BY_TYPE = _DEFINITIONS_SELECT + " WHERE d.type = ? ORDER BY f.path, d.line"
+
+
+def _export_query(
+    table: str, type_filter: str | None
+) -> tuple[str, tuple | None, list[str]] | None:
+    """Look up the export SQL, its parameters and column names (None for an unknown table)."""
+    if table not in EXPORT_QUERIES:
+        return None
+    sql, columns = EXPORT_QUERIES[table]
+    if table == "definitions" and type_filter:
+        return _DEFINITIONS_BY_TYPE, (type_filter,), columns
+    return sql, None, columns
+
+
+def _export_cache_key(
+    index: Path, sql: str, params: tuple | None, output_format: str
+) -> str | None:
+    """Cache key for a file export, or None if there is no parquet index yet.
+
+    The parquet mtime is part of the key, so re-indexing invalidates entries.
+    """
+    try:
+        generation = os.stat(index / "db" / "definitions.parquet").st_mtime_ns
+    except FileNotFoundError:
+        return None
+    digest = hashlib.blake2b(f"{sql}\0{params!r}\0{output_format}".encode(), digest_size=16)
+    return f"{generation}-{digest.hexdigest()}"
+
+
+def _find_cached_export(cache_dir: Path, key: str, output_format: str) -> tuple[Path, int] | None:
+    """Return (cached file, row count) for key if present."""
+    for cached in cache_dir.glob(f"{key}-*.{output_format}"):
+        return cached, int(cached.name[len(key) + 1:].split(".", 1)[0])
+    return None
+
+
+def _store_cached_export(cache_dir: Path, key: str, output: Path, output_format: str, count: int):
+    """Copy a finished export into the cache, dropping entries from older indexes."""
+    generation = key.split("-", 1)[0]
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    for old in cache_dir.iterdir():
+        # Dot-prefixed names are other writers' temp files
+        if not old.name.startswith((f"{generation}-", ".")):
+            old.unlink(missing_ok=True)
+    # A unique temp file per writer, so concurrent exports never collide
+    fd, tmp = tempfile.mkstemp(dir=cache_dir, prefix=".", suffix=".tmp")
+    os.close(fd)
+    try:
+        shutil.copyfile(output, tmp)
+        os.replace(tmp, cache_dir / f"{key}-{count}.{output_format}")
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
 
 def export_cmd(
     ctx: typer.Context,
@@ -47,6 +148,8 @@ def export_cmd(
 
     Export indexed data for external analysis or backup.
     """
+    from jedidb import JediDB
+
     # Resolve output format: explicit > file extension > default (json)
     if output_format is None:
         if output:
@@ -58,71 +161,60 @@ def export_cmd(
     source = get_source_path(ctx)
     index = get_index_path(ctx)
 
+    query = _export_query(table, type_filter)
+    if query is None:
+        print_error(f"Unknown table: {table}")
+        raise typer.Exit(1)
+    sql, params, columns = query
+
+    # Repeated file exports of an unchanged index are served from the cache
+    # without opening the database
+    cache_dir = index / "cache" / "exports"
+    cache_key = _export_cache_key(index, sql, params, output_format) if output else None
+    if cache_key:
+        try:
+            cached = _find_cached_export(cache_dir, cache_key, output_format)
+        except OSError:
+            cached = None
+        if cached:
+            try:
+                shutil.copyfile(cached[0], output)
+            except OSError as e:
+                print_error(f"Failed to write {output}: {e}")
+                raise typer.Exit(1)
+            print_success(f"Wrote {cached[1]} row(s) to {output}")
+            return
+
     try:
-        jedidb = JediDB(source=source, index=index)
+        jedidb = JediDB.open_readonly(source=source, index=index)
     except Exception as e:
         print_error(f"Failed to open database: {e}")
         raise typer.Exit(1)
 
+    # Rows stream from the cursor in batches, to the file or stdout. Files
+    # get the same document as stdout, through a large write buffer.
+    writer = write_data_json if output_format == "json" else write_data_csv
     try:
-        # Build query based on table
-        params = None
-        if table == "definitions":
-            sql = """
-                SELECT d.id, d.name, d.full_name, d.type, d.line, d.col as column,
-                       d.signature, d.docstring, d.is_public, f.path as file
-                FROM definitions d
-                JOIN files f ON d.file_id = f.id
-            """
-            if type_filter:
-                sql += " WHERE d.type = ?"
-                params = (type_filter,)
-            sql += " ORDER BY f.path, d.line"
-            columns = ["id", "name", "full_name", "type", "line", "column", "signature", "docstring", "is_public", "file"]
-
-        elif table == "files":
-            sql = "SELECT id, path, hash, size, modified_at, indexed_at FROM files ORDER BY path"
-            columns = ["id", "path", "hash", "size", "modified_at", "indexed_at"]
-
-        elif table == "refs":
-            sql = """
-                SELECT r.id, r.name, r.line, r.col as column, r.context, f.path as file
-                FROM refs r
-                JOIN files f ON r.file_id = f.id
-                ORDER BY f.path, r.line
-            """
-            columns = ["id", "name", "line", "column", "context", "file"]
-
-        elif table == "imports":
-            sql = """
-                SELECT i.id, i.module, i.name, i.alias, i.line, f.path as file
-                FROM imports i
-                JOIN files f ON i.file_id = f.id
-                ORDER BY f.path, i.line
-            """
-            columns = ["id", "module", "name", "alias", "line", "file"]
-
-        else:
-            print_error(f"Unknown table: {table}")
-            raise typer.Exit(1)
-
         result = jedidb.db.execute(sql, params)
-        rows = result.fetchall()
-    except typer.Exit:
-        raise
+        if output:
+            with open(output, "w", newline="", buffering=OUTPUT_BUFFER_SIZE) as fh:
+                count = writer(fh, columns, result)
+        else:
+            writer(sys.stdout, columns, result)
+    except OSError as e:
+        print_error(f"Failed to write {output or 'stdout'}: {e}")
+        raise typer.Exit(1)
     except Exception as e:
         print_error(f"Query error: {e}")
         raise typer.Exit(1)
     finally:
         jedidb.close()
 
-    # Convert to list of dicts
-    data = [dict(zip(columns, row)) for row in rows]
-
-    # Format output
-    if output_format == "json":
-        content = format_data_json(data)
-    else:
-        content = format_data_csv(data, columns)
-
-    write_output(content, output, len(rows))
+    if output:
+        # The cache is best-effort: the export has succeeded either way
+        if cache_key:
+            try:
+                _store_cached_export(cache_dir, cache_key, output, output_format, count)
+            except OSError:
+                pass
+        print_success(f"Wrote {count} row(s) to {output}")
@@ -1,14 +1,71 @@
 """Index command for JediDB CLI."""
 
+import os
 import shutil
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from pathlib import Path
 from typing import Optional
 
 import typer
 
-from jedidb import JediDB
-from jedidb.cli.formatters import get_source_path, get_index_path, print_success, print_error, print_info, print_warning
+from jedidb.config import Config
+from jedidb.cli.formatters import (
+    get_source_path,
+    get_index_path,
+    get_stderr_console,
+    is_terminal,
+    print_success,
+    print_error,
+    print_info,
+    print_warning,
+)
+from jedidb.utils import discover_files
+
+# Minimum seconds between progress bar refreshes (Rich re-renders under a lock)
+PROGRESS_INTERVAL = 1 / 30
+
+
+def _open_for_indexing(
+    source: Path,
+    index: Path,
+    resolve_refs: bool,
+    base_classes: bool,
+    force: bool,
+    db_dir_exists: bool,
+):
+    """Open the project for indexing, resetting an unreadable index under --force.
+
+    Exits with an error message when the database cannot be opened.
+    """
+    from jedidb import JediDB
+
+    db_dir = index / "db"
+    try:
+        return JediDB(
+            source=source, index=index, resolve_refs=resolve_refs, base_classes=base_classes
+        )
+    except Exception as e:
+        if not (force and db_dir_exists):
+            print_error(f"Failed to initialize database: {e}")
+            if db_dir_exists:
+                print_error("Try 'jedidb index --force' to reset and reindex")
+            raise typer.Exit(1)
+
+        # Database schema is incompatible and we have --force: reset and retry
+        print_warning(f"Database schema error, resetting: {e}")
+
+    shutil.rmtree(db_dir)
+    db_dir.mkdir(parents=True, exist_ok=True)
+    try:
+        return JediDB(
+            source=source, index=index, resolve_refs=resolve_refs, base_classes=base_classes
+        )
+    except Exception as e:
+        print_error(f"Failed to initialize database after reset: {e}")
+        raise typer.Exit(1)
 
 
 def index_cmd(
@@ -73,35 +130,36 @@ def index_cmd(
 
     Use --check to report staleness without indexing (exit 0 = up-to-date, 1 = stale).
 
-    Data is stored as compressed parquet files (~30-40x smaller than DuckDB).
+    Data is stored as compressed parquet files, alongside a larger native
+    DuckDB snapshot that read-only commands query in place for fast opening.
 
     Patterns use simplified syntax: 'Testing' matches directories, 'test_' matches
     file prefixes, '_test' matches suffixes. Full globs like '**/test_*.py' also work.
     """
+    from jedidb import JediDB
+
     source = get_source_path(ctx)
     index = get_index_path(ctx)
     db_dir = index / "db"
 
+    db_dir_exists = db_dir.exists()
+
     # Check mode: just report staleness
     if check:
-        if not db_dir.exists():
+        if not db_dir_exists:
             print_warning("No index found. Run 'jedidb index' to create one.")
             raise typer.Exit(1)
 
+        # Staleness only needs the recorded file hashes: open read-only,
+        # which skips copying the database into memory and loading Jedi
         try:
-            jedidb = JediDB(source=source, index=index)
+            jedidb = JediDB.open_readonly(source=source, index=index)
         except Exception as e:
             print_error(f"Failed to open database: {e}")
             raise typer.Exit(1)
 
         try:
-            all_include = list(include or []) + jedidb.config.include_patterns
-            all_exclude = list(exclude or []) + jedidb.config.exclude_patterns
-
-            staleness = jedidb.indexer.check_staleness(
-                include=all_include if all_include else None,
-                exclude=all_exclude if all_exclude else None,
-            )
+            staleness = jedidb.check_staleness(include=include, exclude=exclude)
         finally:
             jedidb.close()
 
@@ -110,138 +168,137 @@ def index_cmd(
             raise typer.Exit(0)
 
         print_warning("Index is stale")
-        print()
 
-        changed = staleness["changed"]
-        added = staleness["added"]
-        removed = staleness["removed"]
-
-        if changed:
-            print(f"  Changed: {len(changed)} file(s)")
+        # Build the report and write it in one call
+        out = [""]
+        for label, files in (
+            ("Changed:", staleness["changed"]),
+            ("Added:  ", staleness["added"]),
+            ("Removed:", staleness["removed"]),
+        ):
+            if not files:
+                continue
+            out.append(f"  {label} {len(files)} file(s)")
             if verbose:
-                for f in changed[:10]:
-                    print(f"    {f}")
-                if len(changed) > 10:
-                    print(f"    ... and {len(changed) - 10} more")
-
-        if added:
-            print(f"  Added:   {len(added)} file(s)")
-            if verbose:
-                for f in added[:10]:
-                    print(f"    {f}")
-                if len(added) > 10:
-                    print(f"    ... and {len(added) - 10} more")
+                out.extend(f"    {f}" for f in files[:10])
+                if len(files) > 10:
+                    out.append(f"    ... and {len(files) - 10} more")
+        out.append("")
+        out.append("Run 'jedidb index' to update")
+        sys.stdout.write("\n".join(out) + "\n")
+        raise typer.Exit(1)
 
-        if removed:
-            print(f"  Removed: {len(removed)} file(s)")
-            if verbose:
-                for f in removed[:10]:
-                    print(f"    {f}")
-                if len(removed) > 10:
-                    print(f"    ... and {len(removed) - 10} more")
+    config = Config.load(index)
+    all_include = (list(include or []) + config.include_patterns) or None
+    all_exclude = (list(exclude or []) + config.exclude_patterns) or None
 
-        print()
-        print_info("Run 'jedidb index' to update")
-        raise typer.Exit(1)
+    # Walk the source tree on a worker thread while the database opens;
+    # shutdown(wait=False) lets the walk finish without blocking here
+    pool = ThreadPoolExecutor(max_workers=1)
+    discovery = pool.submit(discover_files, paths, all_include, all_exclude, source)
+    pool.shutdown(wait=False)
 
-    try:
-        jedidb = JediDB(source=source, index=index, resolve_refs=resolve_refs, base_classes=base_classes)
-    except Exception as e:
-        # If database schema is incompatible and we have --force, reset and retry
-        if force and db_dir.exists():
-            print_warning(f"Database schema error, resetting: {e}")
-            shutil.rmtree(db_dir)
-            db_dir.mkdir(parents=True, exist_ok=True)
-            try:
-                jedidb = JediDB(source=source, index=index, resolve_refs=resolve_refs, base_classes=base_classes)
-            except Exception as e2:
-                print_error(f"Failed to initialize database after reset: {e2}")
-                raise typer.Exit(1)
-        else:
-            print_error(f"Failed to initialize database: {e}")
-            if db_dir.exists():
-                print_error("Try 'jedidb index --force' to reset and reindex")
-            raise typer.Exit(1)
+    # With no index yet and nothing to index, stop before opening the
+    # database and loading Jedi
+    if not force and not (db_dir_exists and (db_dir / "definitions.parquet").exists()):
+        if not discovery.result():
+            print_info("No Python files to index")
+            return
 
-    # Merge include/exclude with config
-    all_include = list(include or []) + jedidb.config.include_patterns
-    all_exclude = list(exclude or []) + jedidb.config.exclude_patterns
+    jedidb = _open_for_indexing(source, index, resolve_refs, base_classes, force, db_dir_exists)
 
     # Use Rich progress bar only for TTY, otherwise simple text
-    use_progress_bar = not quiet and sys.stderr.isatty()
+    use_progress_bar = not quiet and is_terminal(sys.stderr)
 
+    # One index_files call for every mode; only the progress reporting differs
+    progress_context = nullcontext()
     try:
         if use_progress_bar:
             from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
-            from rich.console import Console
 
-            console = Console(stderr=True)
-            with Progress(
+            progress = progress_context = Progress(
                 SpinnerColumn(),
                 TextColumn("[progress.description]{task.description}"),
                 BarColumn(),
                 TaskProgressColumn(),
-                console=console,
-            ) as progress:
-                task = progress.add_task("Indexing files...", total=None)
-
-                def on_progress(file_path: str, current: int, total: int):
-                    progress.update(task, total=total, completed=current, description=f"Indexing: {Path(file_path).name}")
+                console=get_stderr_console(),
+            )
+            task = progress.add_task("Indexing files...", total=None)
 
-                jedidb.indexer.progress_callback = on_progress
+            last_update = 0.0
 
-                stats = jedidb.index_files(
-                    paths=paths,
-                    include=all_include if all_include else None,
-                    exclude=all_exclude if all_exclude else None,
-                    force=force,
+            def on_progress(file_path: str, current: int, total: int):
+                nonlocal last_update
+                now = time.monotonic()
+                if current != total and now - last_update < PROGRESS_INTERVAL:
+                    return
+                last_update = now
+                name = os.path.basename(file_path)
+                progress.update(
+                    task, total=total, completed=current, description=f"Indexing: {name}"
                 )
+
+            jedidb.indexer.progress_callback = on_progress
         elif not quiet:
+            # Same per-file lines, but written to stderr in batches at most
+            # PROGRESS_INTERVAL apart instead of one write per file
+            pending_lines = []
+            last_flush = time.monotonic()
+
             def on_progress(file_path: str, current: int, total: int):
-                print(f"Indexing [{current}/{total}]: {Path(file_path).name}", file=sys.stderr)
+                nonlocal last_flush
+                name = os.path.basename(file_path)
+                pending_lines.append(f"Indexing [{current}/{total}]: {name}\n")
+                now = time.monotonic()
+                if current != total and now - last_flush < PROGRESS_INTERVAL:
+                    return
+                last_flush = now
+                sys.stderr.write("".join(pending_lines))
+                sys.stderr.flush()
+                pending_lines.clear()
 
             jedidb.indexer.progress_callback = on_progress
 
+        # index_files merges the config.toml patterns itself
+        with progress_context:
             stats = jedidb.index_files(
                 paths=paths,
-                include=all_include if all_include else None,
-                exclude=all_exclude if all_exclude else None,
-                force=force,
-            )
-        else:
-            stats = jedidb.index_files(
-                paths=paths,
-                include=all_include if all_include else None,
-                exclude=all_exclude if all_exclude else None,
+                include=include,
+                exclude=exclude,
                 force=force,
+                files=discovery.result(),
             )
     finally:
         jedidb.close()
 
-    # Print results
-    print()
-
+    # Print results, one write per stream
     if stats.get("index_skipped"):
-        print_success(f"Index is up-to-date ({stats['files_skipped']} files)")
+        sys.stdout.write(f"\nOK: Index is up-to-date ({stats['files_skipped']} files)\n")
         return
 
-    print_success(f"Indexed {stats['files_indexed']} files")
+    out = ["", f"OK: Indexed {stats['files_indexed']} files"]
 
     if stats["files_removed"] > 0:
-        print_info(f"Removed {stats['files_removed']} deleted files")
+        out.append(f"Removed {stats['files_removed']} deleted files")
 
-    print()
-    print(f"  Definitions: {stats['definitions_added']}")
-    print(f"  References:  {stats['references_added']}")
-    print(f"  Imports:     {stats['imports_added']}")
+    out.append("")
+    out.append(f"  Definitions: {stats['definitions_added']}")
+    out.append(f"  References:  {stats['references_added']}")
+    out.append(f"  Imports:     {stats['imports_added']}")
 
     if stats.get("packed"):
-        print(f"  Packed:      {stats['parquet_size']:,} bytes")
-
-    if stats["errors"]:
-        print()
-        print_error(f"Errors in {len(stats['errors'])} files:")
-        for err in stats["errors"][:5]:
-            print(f"  {err['file']}: {err['error']}", file=sys.stderr)
-        if len(stats["errors"]) > 5:
-            print(f"  ... and {len(stats['errors']) - 5} more", file=sys.stderr)
+        out.append(f"  Packed:      {stats['parquet_size']:,} bytes")
+        out.append(f"  Snapshot:    {stats['snapshot_size']:,} bytes")
+
+    errors = stats["errors"]
+    if errors:
+        out.append("")
+    sys.stdout.write("\n".join(out) + "\n")
+
+    if errors:
+        err_out = [f"Error: Errors in {len(errors)} files:"]
+        err_out.extend(f"  {err['file']}: {err['error']}" for err in errors[:5])
+        if len(errors) > 5:
+            err_out.append(f"  ... and {len(errors) - 5} more")
+        sys.stdout.flush()
+        sys.stderr.write("\n".join(err_out) + "\n")
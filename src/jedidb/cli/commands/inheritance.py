@@ -1,20 +1,24 @@
 """Inheritance command for JediDB CLI."""
 
-from typing import Optional
+from typing import TYPE_CHECKING
 
 import typer
 
-from jedidb import JediDB
 from jedidb.cli.formatters import (
-    get_source_path,
-    get_index_path,
+    OutputFormat,
+    format_data_jsonl,
     format_json,
     get_default_format,
-    OutputFormat,
+    get_index_path,
+    get_source_path,
     print_error,
     print_info,
+    write_output,
 )
 
+if TYPE_CHECKING:
+    from jedidb import JediDB
+
 
 def format_inheritance_table(bases: list[dict], show_position: bool = False) -> str:
     """Format base classes as a plain text table."""
@@ -55,8 +59,96 @@ def format_children_table(children: list[dict]) -> str:
     return "\n".join(lines)
 
 
+# Every inheritance edge format_tree can reach from one class, in a single
+# statement. The class/base join is computed once as edges; ancestors are
+# then walked through base classes and descendants through subclasses, each
+# up to $max_depth levels. Rows are (direction, class, related class),
+# ordered the way format_tree visits them.
+INHERITANCE_TREE_QUERY = """
+    WITH RECURSIVE
+    edges AS MATERIALIZED (
+        SELECT d.full_name AS cls, cb.base_full_name AS base, cb.position
+        FROM class_bases cb
+        JOIN definitions d ON cb.class_id = d.id
+    ),
+    up(name, depth) AS (
+        SELECT $root::VARCHAR, 0
+        UNION
+        SELECT e.base, up.depth + 1
+        FROM up
+        JOIN edges e ON e.cls = up.name
+        WHERE up.depth < $max_depth::INTEGER AND e.base IS NOT NULL
+    ),
+    down(name, depth) AS (
+        SELECT $root::VARCHAR, 0
+        UNION
+        SELECT e.cls, down.depth + 1
+        FROM down
+        JOIN edges e ON e.base = down.name
+        WHERE down.depth < $max_depth::INTEGER AND e.cls IS NOT NULL
+    )
+    SELECT 'up' AS direction, cls AS name, base AS related, position
+    FROM edges
+    WHERE cls IN (SELECT name FROM up)
+    UNION ALL
+    SELECT 'down', base, cls, NULL
+    FROM edges
+    WHERE base IN (SELECT name FROM down)
+    ORDER BY direction, name, position, related
+"""
+
+
+# Direct base classes of one class definition (by id), in declaration
+# order. Rows are aggregated into one list of structs, which DuckDB converts
+# to a list of dicts in a single fetch without a Python loop over rows.
+BASES_QUERY = """
+    SELECT list({
+        'base_name': base_name,
+        'base_full_name': base_full_name,
+        'base_id': base_id,
+        'position': position
+    } ORDER BY position)
+    FROM class_bases
+    WHERE class_id = ?
+"""
+
+# Direct subclasses of one class, with the file defining each (aggregated
+# the same way). Matched on base_full_name, since base_id is only resolved
+# for bases defined in the same file.
+SUBCLASSES_QUERY = """
+    SELECT list({
+        'full_name': d.full_name,
+        'name': d.name,
+        'file_path': f.path
+    } ORDER BY d.full_name)
+    FROM class_bases cb
+    JOIN definitions d ON cb.class_id = d.id
+    JOIN files f ON d.file_id = f.id
+    WHERE cb.base_full_name = ?
+"""
+
+
+def load_inheritance_tree(
+    jedidb: "JediDB", full_name: str, max_depth: int = 10
+) -> tuple[dict[str, list[str]], dict[str, list[str]]]:
+    """Fetch the inheritance edges around full_name in one query.
+
+    Returns:
+        (bases, children): base classes and subclasses by class full name
+    """
+    bases: dict[str, list[str]] = {}
+    children: dict[str, list[str]] = {}
+    rows = jedidb.db.execute(
+        INHERITANCE_TREE_QUERY, {"root": full_name, "max_depth": max_depth}
+    ).fetchall()
+    for direction, name, related, _ in rows:
+        if related:
+            (bases if direction == "up" else children).setdefault(name, []).append(related)
+    return bases, children
+
+
 def format_tree(
-    jedidb: JediDB,
+    jedidb: "JediDB",
     full_name: str,
     prefix: str = "",
     is_last: bool = True,
@@ -64,66 +156,61 @@ def format_tree(
     visited: set | None = None,
     depth: int = 0,
     max_depth: int = 10,
+    edges: tuple[dict[str, list[str]], dict[str, list[str]]] | None = None,
 ) -> list[str]:
     """Format inheritance as a tree.
 
+    Each class is shown once, at the first place the depth-first walk
+    reaches it.
+
     Args:
+        prefix, is_last, depth: where full_name sits when drawn as a branch
+            of a larger tree (depth 0 draws it as the root)
         direction: "up" for ancestors, "down" for descendants, "both" for full tree
+        visited: names already drawn, which are skipped; updated in place
+        edges: (bases, children) from load_inheritance_tree; fetched with one
+            query if not given
     """
     if visited is None:
         visited = set()
-
-    if full_name in visited or depth > max_depth:
-        return []
-
-    visited.add(full_name)
+    if edges is None:
+        edges = load_inheritance_tree(jedidb, full_name, max_depth)
+    bases_of, children_of = edges
 
     lines = []
-    connector = "`-- " if is_last else "|-- "
 
-    if depth == 0:
-        lines.append(full_name)
-    else:
-        lines.append(f"{prefix}{connector}{full_name}")
-
-    extension = "    " if is_last else "|   "
-    new_prefix = prefix + extension if depth > 0 else ""
-
-    if direction in ("up", "both"):
-        # Get base classes (ancestors)
-        query = """
-            SELECT base_full_name FROM class_bases cb
-            JOIN definitions d ON cb.class_id = d.id
-            WHERE d.full_name = ?
-            ORDER BY cb.position
-        """
-        results = jedidb.db.execute(query, (full_name,)).fetchall()
-        bases = [r[0] for r in results if r[0]]
-
-        for i, base in enumerate(bases):
-            is_last_base = i == len(bases) - 1 and direction == "up"
-            child_lines = format_tree(
-                jedidb, base, new_prefix, is_last_base, "up", visited, depth + 1, max_depth
-            )
-            lines.extend(child_lines)
-
-    if direction in ("down", "both"):
-        # Get child classes (descendants)
-        query = """
-            SELECT d.full_name FROM class_bases cb
-            JOIN definitions d ON cb.class_id = d.id
-            WHERE cb.base_full_name = ?
-            ORDER BY d.full_name
-        """
-        results = jedidb.db.execute(query, (full_name,)).fetchall()
-        children = [r[0] for r in results if r[0]]
-
-        for i, child in enumerate(children):
-            is_last_child = i == len(children) - 1
-            child_lines = format_tree(
-                jedidb, child, new_prefix, is_last_child, "down", visited, depth + 1, max_depth
-            )
-            lines.extend(child_lines)
+    # Walk with an explicit stack of (name, direction, depth, prefix,
+    # is_last); entries are pushed in reverse so they pop in display order
+    stack = [(full_name, direction, depth, prefix, is_last)]
+    while stack:
+        name, node_direction, depth, prefix, is_last = stack.pop()
+        if name in visited or depth > max_depth:
+            continue
+        visited.add(name)
+
+        if depth == 0:
+            lines.append(name)
+            child_prefix = ""
+        else:
+            lines.append(f"{prefix}{'`-- ' if is_last else '|-- '}{name}")
+            child_prefix = prefix + ("    " if is_last else "|   ")
+
+        pending = []
+        if node_direction in ("up", "both"):
+            # Base classes (ancestors); under "both" the subclasses follow,
+            # so no base is drawn as the last branch
+            bases = bases_of.get(name, [])
+            last = len(bases) - 1
+            for i, base in enumerate(bases):
+                base_is_last = i == last and node_direction == "up"
+                pending.append((base, "up", depth + 1, child_prefix, base_is_last))
+        if node_direction in ("down", "both"):
+            # Child classes (descendants)
+            children = children_of.get(name, [])
+            last = len(children) - 1
+            for i, child in enumerate(children):
+                pending.append((child, "down", depth + 1, child_prefix, i == last))
+        stack.extend(reversed(pending))
 
     return lines
 
@@ -146,7 +233,7 @@ def inheritance_cmd(
         "-t",
         help="Show full inheritance tree (ancestors and descendants)",
     ),
-    output_format: Optional[OutputFormat] = typer.Option(
+    output_format: OutputFormat | None = typer.Option(
         None,
         "--format",
         "-f",
@@ -169,6 +256,8 @@ def inheritance_cmd(
 
         jedidb inheritance BaseModel --format json
     """
+    from jedidb import JediDB
+
     if output_format is None:
         output_format = get_default_format()
 
@@ -176,7 +265,7 @@ def inheritance_cmd(
     index = get_index_path(ctx)
 
     try:
-        jedidb = JediDB(source=source, index=index)
+        jedidb = JediDB.open_readonly(source=source, index=index)
     except Exception as e:
         print_error(f"Failed to open database: {e}")
         raise typer.Exit(1)
@@ -198,79 +287,49 @@ def inheritance_cmd(
             tree_lines = format_tree(jedidb, definition.full_name, direction="both")
         elif children:
             # Show what inherits from this class
-            query = """
-                SELECT d.full_name, d.name, f.path
-                FROM class_bases cb
-                JOIN definitions d ON cb.class_id = d.id
-                JOIN files f ON d.file_id = f.id
-                WHERE cb.base_full_name = ?
-                ORDER BY d.full_name
-            """
-            results = jedidb.db.execute(query, (definition.full_name,)).fetchall()
-            child_classes = [
-                {"full_name": r[0], "name": r[1], "file_path": r[2]}
-                for r in results
-            ]
+            result = jedidb.db.execute(SUBCLASSES_QUERY, (definition.full_name,))
+            child_classes = result.fetchone()[0] or []
         else:
             # Show what this class inherits from (default)
-            query = """
-                SELECT cb.base_name, cb.base_full_name, cb.base_id, cb.position
-                FROM class_bases cb
-                JOIN definitions d ON cb.class_id = d.id
-                WHERE d.full_name = ?
-                ORDER BY cb.position
-            """
-            results = jedidb.db.execute(query, (definition.full_name,)).fetchall()
-            bases = [
-                {
-                    "base_name": r[0],
-                    "base_full_name": r[1],
-                    "base_id": r[2],
-                    "position": r[3],
-                }
-                for r in results
-            ]
+            bases = jedidb.db.execute(BASES_QUERY, (definition.id,)).fetchone()[0] or []
     finally:
         jedidb.close()
 
-    # Output formatting (after close)
+    # Output formatting (after close); each result is written in one call
     if tree:
         if output_format == OutputFormat.json:
-            print(format_json({"tree": tree_lines}))
+            content = format_json({"tree": tree_lines})
         else:
-            print(f"Inheritance tree for {definition.full_name}:")
-            print()
-            for line in tree_lines:
-                print(line)
+            content = "\n".join([f"Inheritance tree for {definition.full_name}:", "", *tree_lines])
     elif children:
         if not child_classes:
             print_info(f"No classes inherit from {definition.full_name}")
             raise typer.Exit(0)
 
         if output_format == OutputFormat.json:
-            print(format_json(child_classes))
+            content = format_json(child_classes)
         elif output_format == OutputFormat.jsonl:
-            import json
-            for c in child_classes:
-                print(json.dumps(c, separators=(",", ":")))
+            content = format_data_jsonl(child_classes)
         else:
-            print(f"Classes inheriting from {definition.full_name}:")
-            print()
-            print(format_children_table(child_classes))
-            print(f"\n{len(child_classes)} subclass(es)")
+            content = (
+                f"Classes inheriting from {definition.full_name}:\n\n"
+                f"{format_children_table(child_classes)}\n"
+                f"\n{len(child_classes)} subclass(es)"
+            )
     else:
         if not bases:
             print_info(f"No base classes found for {definition.full_name}")
             raise typer.Exit(0)
 
         if output_format == OutputFormat.json:
-            print(format_json(bases))
+            content = format_json(bases)
         elif output_format == OutputFormat.jsonl:
-            import json
-            for b in bases:
-                print(json.dumps(b, separators=(",", ":")))
+            content = format_data_jsonl(bases)
         else:
-            print(f"Base classes of {definition.full_name}:")
-            print()
-            print(format_inheritance_table(bases, show_position=len(bases) > 1))
-            print(f"\n{len(bases)} base class(es)")
+            content = (
+                f"Base classes of {definition.full_name}:\n\n"
+                f"{format_inheritance_table(bases, show_position=len(bases) > 1)}\n"
+                f"\n{len(bases)} base class(es)"
+            )
+
+    write_output(content, None)
@@ -1,5 +1,6 @@
 """Init command for JediDB CLI."""
 
+import os
 import sys
 
 import typer
@@ -59,38 +60,36 @@ def init_cmd(
         print(f"Error: Source directory does not exist: {source}", file=sys.stderr)
         raise typer.Exit(1)
 
-    # Check for existing configuration
+    # Check for existing configuration; past this point it is always written
     config_file = index / "config.toml"
 
-    if config_file.exists() and not force:
+    if not force and os.path.exists(config_file):
         print_warning(f"Configuration already exists: {config_file}")
         print_info("Use --force to overwrite")
         raise typer.Exit(1)
 
     # Create index directory structure
-    index.mkdir(parents=True, exist_ok=True)
-    (index / "db").mkdir(exist_ok=True)
+    os.makedirs(index / "db", exist_ok=True)
     print_success(f"Created index directory: {index}")
 
     # Create config file
-    if not config_file.exists() or force:
-        config_lines = ["# JediDB Configuration", ""]
+    config_lines = ["# JediDB Configuration", ""]
 
-        if include:
-            include_str = ", ".join(f'"{p}"' for p in include)
-            config_lines.append(f"include = [{include_str}]")
-        else:
-            config_lines.append("# include = []  # Empty means all .py files (default)")
+    if include:
+        include_str = ", ".join(f'"{p}"' for p in include)
+        config_lines.append(f"include = [{include_str}]")
+    else:
+        config_lines.append("# include = []  # Empty means all .py files (default)")
 
-        if exclude:
-            exclude_str = ", ".join(f'"{p}"' for p in exclude)
-            config_lines.append(f"exclude = [{exclude_str}]")
-        else:
-            config_lines.append('# exclude = ["test_", "_test"]  # or use globs: "**/test_*.py"')
+    if exclude:
+        exclude_str = ", ".join(f'"{p}"' for p in exclude)
+        config_lines.append(f"exclude = [{exclude_str}]")
+    else:
+        config_lines.append('# exclude = ["test_", "_test"]  # or use globs: "**/test_*.py"')
 
-        config_lines.append("")
-        config_file.write_text("\n".join(config_lines))
-        print_success(f"Created configuration: {config_file}")
+    config_lines.append("")
+    config_file.write_text("\n".join(config_lines))
+    print_success(f"Created configuration: {config_file}")
 
     # Add .jedidb to .gitignore if it exists and index is inside source
     if index.is_relative_to(source):
@@ -98,12 +97,21 @@ def init_cmd(
         relative_index = index.relative_to(source)
         gitignore_entry = f"{relative_index}/"
 
-        if gitignore_path.exists():
-            gitignore_content = gitignore_path.read_text()
-            if gitignore_entry not in gitignore_content and ".jedidb/" not in gitignore_content:
-                with open(gitignore_path, "a") as f:
+        # One open both checks and appends; a missing .gitignore is left alone
+        try:
+            with open(gitignore_path, "r+") as f:
+                gitignore_content = f.read()
+                added = (
+                    gitignore_entry not in gitignore_content
+                    and ".jedidb/" not in gitignore_content
+                )
+                if added:
+                    # Reading left the position at the end of the file
                     f.write(f"\n# JediDB\n{gitignore_entry}\n")
-                print_success(f"Added {gitignore_entry} to .gitignore")
+        except FileNotFoundError:
+            added = False
+        if added:
+            print_success(f"Added {gitignore_entry} to .gitignore")
 
     print()
     print_info("Next steps:")
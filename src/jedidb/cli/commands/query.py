@@ -1,24 +1,35 @@
 """Query command for JediDB CLI."""
 
+import sys
 from pathlib import Path
 from typing import Optional
 
 import typer
 
-from jedidb import JediDB
 from jedidb.cli.formatters import (
     get_source_path,
     get_index_path,
-    format_data_json,
-    format_data_jsonl,
-    format_data_csv,
     resolve_output_format,
+    write_data_csv,
+    write_data_json,
+    write_data_jsonl,
     write_output,
     OutputFormat,
+    OUTPUT_BUFFER_SIZE,
+    PrefetchedResult,
     print_error,
+    print_success,
 )
 
 
+# Formats written straight from the result cursor, one batch at a time
+STREAM_WRITERS = {
+    OutputFormat.json: write_data_json,
+    OutputFormat.jsonl: write_data_jsonl,
+    OutputFormat.csv: write_data_csv,
+}
+
+
 def query_cmd(
     ctx: typer.Context,
     sql: str = typer.Argument(
@@ -35,7 +46,7 @@ def query_cmd(
         None,
         "--limit",
         "-n",
-        help="Limit number of results (adds LIMIT clause if not present)",
+        help="Limit number of results",
     ),
     output: Optional[Path] = typer.Option(
         None,
@@ -62,64 +73,80 @@ def query_cmd(
 
         jedidb query "SELECT * FROM definitions" -o defs.csv  # output to CSV
     """
+    from jedidb import JediDB
+
     output_format = resolve_output_format(output_format, output)
 
     source = get_source_path(ctx)
     index = get_index_path(ctx)
 
+    # Opened read-only, a current native snapshot is queried in place rather
+    # than copied into memory, so repeated queries start fast and share the
+    # OS page cache
     try:
-        jedidb = JediDB(source=source, index=index)
+        jedidb = JediDB.open_readonly(source=source, index=index)
     except Exception as e:
         print_error(f"Failed to open database: {e}")
         raise typer.Exit(1)
 
-    # Add LIMIT if requested and not already present
-    query_sql = sql
-    if limit and "limit" not in sql.lower():
-        query_sql = f"{sql} LIMIT {limit}"
-
     try:
-        result = jedidb.db.execute(query_sql)
-        rows = result.fetchall()
-        columns = [desc[0] for desc in result.description] if result.description else []
+        # The relational API adds --limit to DuckDB's plan for any statement
+        # that returns rows (SELECT, DESCRIBE, PRAGMA, ...); other statements
+        # run immediately and return None
+        relation = jedidb.db.conn.sql(sql)
+        result = None
+        if relation is not None:
+            if limit:
+                relation = relation.limit(limit)
+            columns = relation.columns
+            result = PrefetchedResult(relation)
     except Exception as e:
+        jedidb.close()
         print_error(f"Query error: {e}")
         raise typer.Exit(1)
+
+    try:
+        if result is None or not result.has_rows:
+            print("No results")
+            raise typer.Exit(0)
+
+        # JSON, JSONL and CSV stream batch by batch instead of holding
+        # every row (and a dict per row) in memory. Files get the same
+        # document as stdout. Later batches are fetched while writing, so
+        # their errors are reported here too.
+        writer = STREAM_WRITERS.get(output_format)
+        try:
+            if writer is None:
+                rows = result.fetchall()
+            elif output:
+                with open(output, "w", newline="", buffering=OUTPUT_BUFFER_SIZE) as fh:
+                    count = writer(fh, columns, result)
+            else:
+                writer(sys.stdout, columns, result)
+        except Exception as e:
+            print_error(f"Query error: {e}")
+            raise typer.Exit(1)
+
+        if writer is not None:
+            if output:
+                print_success(f"Wrote {count} row(s) to {output}")
+            return
     finally:
         jedidb.close()
 
-    if not rows:
-        print("No results")
-        raise typer.Exit(0)
-
-    # Convert to list of dicts
-    data = [dict(zip(columns, row)) for row in rows]
-
-    # Format output
-    if output_format == OutputFormat.json:
-        content = format_data_json(data)
-    elif output_format == OutputFormat.jsonl:
-        content = format_data_jsonl(data)
-    elif output_format == OutputFormat.csv:
-        content = format_data_csv(data, columns)
-    else:
-        # Table format - plain text
-        col_widths = [len(c) for c in columns]
-        for row in rows:
-            for i, val in enumerate(row):
-                col_widths[i] = max(col_widths[i], len(str(val) if val is not None else ""))
-
-        lines = []
-        # Header
-        header = "  ".join(f"{col:<{col_widths[i]}}" for i, col in enumerate(columns))
-        lines.append(header)
-        lines.append("-" * len(header))
-
-        # Rows
-        for row in rows:
-            lines.append("  ".join(f"{(str(v) if v is not None else ''):<{col_widths[i]}}" for i, v in enumerate(row)))
-
-        lines.append(f"\n{len(rows)} row(s)")
-        content = "\n".join(lines)
+    # Table format - plain text. Each cell is converted to a string once,
+    # and columns are sized and padded with C-level len/ljust
+    str_rows = [["" if v is None else str(v) for v in row] for row in rows]
+    col_widths = [max(len(c), *map(len, cells)) for c, cells in zip(columns, zip(*str_rows))]
+
+    # Header
+    header = "  ".join(map(str.ljust, columns, col_widths))
+    lines = [header, "-" * len(header)]
+
+    # Rows
+    lines.extend("  ".join(map(str.ljust, str_row, col_widths)) for str_row in str_rows)
+
+    lines.append(f"\n{len(rows)} row(s)")
+    content = "\n".join(lines)
 
     write_output(content, output, len(rows))
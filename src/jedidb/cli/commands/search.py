@@ -1,19 +1,21 @@
 """Search command for JediDB CLI."""
 
+import hashlib
+import os
+import tempfile
 from enum import Enum
 from pathlib import Path
 from typing import Optional
 
 import typer
 
-from jedidb import JediDB
 from jedidb.cli.formatters import (
     get_source_path,
     get_index_path,
     format_search_results_table,
     format_data_json,
     format_data_jsonl,
-    format_data_csv,
+    format_rows_csv,
     resolve_output_format,
     write_output,
     OutputFormat,
@@ -30,6 +32,104 @@ class DefinitionType(str, Enum):
     param = "param"
 
 
+# Output columns for JSON/JSONL/CSV search results
+SEARCH_COLUMNS = ("name", "full_name", "type", "file", "line", "score", "signature", "docstring")
+
+
+def search_rows(results: list) -> list[tuple]:
+    """Row values for search results, in SEARCH_COLUMNS order."""
+    return [
+        (
+            r.definition.name,
+            r.definition.full_name,
+            r.definition.type,
+            r.definition.file_path,
+            r.definition.line,
+            r.score,
+            r.definition.signature,
+            r.definition.docstring,
+        )
+        for r in results
+    ]
+
+
+def search_results_from_rows(rows: list[dict]) -> list:
+    """Rebuild search results from rows keyed by SEARCH_COLUMNS."""
+    from jedidb.core.models import Definition, SearchResult
+
+    return [
+        SearchResult(
+            Definition(
+                name=row["name"],
+                full_name=row["full_name"],
+                type=row["type"],
+                file_path=row["file"],
+                line=row["line"],
+                signature=row["signature"],
+                docstring=row["docstring"],
+            ),
+            score=row["score"],
+        )
+        for row in rows
+    ]
+
+
+def _search_cache_key(index: Path, *args) -> str | None:
+    """Cache key for a search, or None if there is no parquet index yet.
+
+    The parquet mtime is part of the key, so re-indexing invalidates entries.
+    """
+    try:
+        generation = os.stat(index / "db" / "definitions.parquet").st_mtime_ns
+    except FileNotFoundError:
+        return None
+    digest = hashlib.blake2b("\0".join(map(repr, args)).encode(), digest_size=16)
+    return f"{generation}-{digest.hexdigest()}"
+
+
+# Slots in the search cache. Each search maps to one slot file by its key,
+# and a newer search for the same slot replaces it, so the cache never holds
+# more files than this and needs no eviction pass.
+SEARCH_CACHE_SIZE = 256
+
+
+def _search_cache_slot(cache_dir: Path, key: str) -> Path:
+    """Slot file for key. The generation is left out, so a search repeated
+    after re-indexing reuses its old slot."""
+    digest = key.rsplit("-", 1)[1]
+    return cache_dir / f"{int(digest, 16) % SEARCH_CACHE_SIZE}.txt"
+
+
+def _find_cached_search(cache_dir: Path, key: str) -> tuple[str, int] | None:
+    """Return (rendered output, result count) for key if present."""
+    try:
+        # newline="" keeps CSV's \r\n line endings intact
+        with open(_search_cache_slot(cache_dir, key), newline="") as fh:
+            cached_key, _, count = fh.readline().rstrip("\n").partition(" ")
+            if cached_key != key:
+                return None
+            return fh.read(), int(count)
+    except FileNotFoundError:
+        return None
+
+
+def _store_cached_search(cache_dir: Path, key: str, content: str, count: int):
+    """Save rendered output in key's slot, behind a "<key> <count>" header line."""
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    # A unique temp file per writer, so concurrent searches for the same
+    # slot never write into each other's file
+    fd, tmp = tempfile.mkstemp(dir=cache_dir, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", newline="") as fh:
+            fh.write(f"{key} {count}\n")
+            fh.write(content)
+        os.replace(tmp, _search_cache_slot(cache_dir, key))
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
 def search_cmd(
     ctx: typer.Context,
     query: str = typer.Argument(
@@ -54,6 +154,16 @@ def search_cmd(
         "-p",
         help="Include private definitions (starting with _)",
     ),
+    fast: bool = typer.Option(
+        False,
+        "--fast",
+        help="Match names by prefix only, without full-text ranking (for completion)",
+    ),
+    cache: bool = typer.Option(
+        False,
+        "--cache",
+        help="Reuse output of the same search on an unchanged index (kept in the index's cache/)",
+    ),
     output_format: Optional[OutputFormat] = typer.Option(
         None,
         "--format",
@@ -78,6 +188,10 @@ def search_cmd(
 
         jedidb search "get*"             # prefix search: getValue, get_config
 
+        jedidb search get --fast         # same prefix search, for completion
+
+        jedidb search get --fast --cache # repeated completions skip the database
+
         jedidb search Model --type class # only classes
 
         jedidb search test -p            # include private (_test, __init__)
@@ -86,54 +200,79 @@ def search_cmd(
 
         jedidb search api -o results.csv # output to CSV file
     """
+    from jedidb import JediDB
+    from jedidb.cli.commands.serve import request_server
+
     output_format = resolve_output_format(output_format, output)
 
     source = get_source_path(ctx)
     index = get_index_path(ctx)
 
-    try:
-        jedidb = JediDB(source=source, index=index)
-    except Exception as e:
-        print_error(f"Failed to open database: {e}")
-        raise typer.Exit(1)
+    # With --cache, repeated searches of an unchanged index (shell
+    # completion, editor integrations) are served from the cache without
+    # opening the database
+    cache_dir = index / "cache" / "search"
+    cache_key = cache and _search_cache_key(
+        index, query, type.value if type else None, limit, include_private, fast,
+        output_format.value,
+    )
+    if cache_key:
+        # The cache is best-effort: an unreadable or read-only index
+        # directory just means searching without it
+        try:
+            cached = _find_cached_search(cache_dir, cache_key)
+        except OSError:
+            cached = None
+        if cached:
+            write_output(cached[0], output, cached[1])
+            return
 
-    try:
-        results = jedidb.search_engine.search(
-            query,
-            type=type.value if type else None,
-            limit=limit,
-            include_private=include_private,
-        )
-    finally:
-        jedidb.close()
+    # A running 'jedidb serve' answers from its open index; otherwise, or if
+    # it fails, the index is opened here
+    response = request_server(index, {
+        "command": "search", "query": query, "type": type.value if type else None,
+        "limit": limit, "private": include_private, "fast": fast,
+    })
+    if response is not None and "results" in response:
+        results = search_results_from_rows(response["results"])
+    else:
+        try:
+            jedidb = JediDB.open_readonly(source=source, index=index)
+        except Exception as e:
+            print_error(f"Failed to open database: {e}")
+            raise typer.Exit(1)
+
+        try:
+            results = jedidb.search_engine.search(
+                query,
+                type=type.value if type else None,
+                limit=limit,
+                include_private=include_private,
+                fast=fast,
+            )
+        finally:
+            jedidb.close()
 
     if not results:
         print_info("No results found")
         raise typer.Exit(0)
 
-    # Convert results to list of dicts
-    data = [
-        {
-            "name": r.definition.name,
-            "full_name": r.definition.full_name,
-            "type": r.definition.type,
-            "file": r.definition.file_path,
-            "line": r.definition.line,
-            "score": r.score,
-            "signature": r.definition.signature,
-            "docstring": r.definition.docstring,
-        }
-        for r in results
-    ]
+    # Row values in SEARCH_COLUMNS order; only the JSON formats need dicts
+    rows = search_rows(results)
 
     # Format output
     if output_format == OutputFormat.json:
-        content = format_data_json(data)
+        content = format_data_json([dict(zip(SEARCH_COLUMNS, row)) for row in rows])
     elif output_format == OutputFormat.jsonl:
-        content = format_data_jsonl(data)
+        content = format_data_jsonl([dict(zip(SEARCH_COLUMNS, row)) for row in rows])
     elif output_format == OutputFormat.csv:
-        content = format_data_csv(data)
+        content = format_rows_csv(SEARCH_COLUMNS, rows)
     else:
         content = format_search_results_table(results) + f"\n\n{len(results)} result(s)"
 
+    if cache_key:
+        try:
+            _store_cached_search(cache_dir, cache_key, content, len(results))
+        except OSError:
+            pass
     write_output(content, output, len(results))
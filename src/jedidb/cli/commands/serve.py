@@ -0,0 +1,242 @@
+"""Serve command for JediDB CLI."""
+
+import hashlib
+import json
+import os
+import socket
+import sys
+import tempfile
+from pathlib import Path
+
+import typer
+
+from jedidb.cli.commands.search import SEARCH_COLUMNS, search_rows
+from jedidb.cli.commands.show import show_data
+from jedidb.cli.formatters import (
+    format_data_jsonl,
+    get_index_path,
+    get_source_path,
+    print_error,
+    print_info,
+)
+
+# Seconds a client waits for the server, and the server for a client,
+# before giving up on the connection
+SERVER_TIMEOUT = 5.0
+
+
+def _handle_search(jedidb, request: dict) -> dict:
+    """Answer a search request with rows keyed by SEARCH_COLUMNS."""
+    results = jedidb.search_engine.search(
+        request["query"],
+        type=request.get("type"),
+        limit=request.get("limit", 20),
+        include_private=request.get("private", False),
+        fast=request.get("fast", False),
+    )
+    return {"results": [dict(zip(SEARCH_COLUMNS, row)) for row in search_rows(results)]}
+
+
+def _handle_show(jedidb, request: dict) -> dict:
+    """Answer a show request with the same shape as 'jedidb show -f json'."""
+    definition = jedidb.search_engine.get_definition(request["name"])
+    if not definition:
+        return {"error": f"Definition not found: {request['name']}"}
+    references = None
+    if request.get("refs"):
+        references = jedidb.search_engine.find_references(definition.full_name or definition.name)
+    return show_data(definition, references)
+
+
+HANDLERS = {
+    "search": _handle_search,
+    "show": _handle_show,
+}
+
+
+def _generation(jedidb) -> int:
+    """Index generation, used to notice a re-index while serving."""
+    return os.stat(jedidb.db_dir / "definitions.parquet").st_mtime_ns
+
+
+def socket_path(index: Path) -> Path:
+    """Unix socket that 'jedidb serve' listens on for an index."""
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    digest = hashlib.sha1(str(Path(index).resolve()).encode()).hexdigest()
+    return Path(runtime_dir) / f"jedidb-{digest}.sock"
+
+
+def request_server(index: Path, request: dict) -> dict | None:
+    """Send one request to the 'jedidb serve' running for index.
+
+    Returns:
+        The response, or None if no server is listening (the caller then
+        opens the index itself)
+    """
+    path = socket_path(index)
+    # No socket file means no server; checked before creating a socket so
+    # the common case costs a single stat
+    if not hasattr(socket, "AF_UNIX") or not os.path.exists(path):
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(SERVER_TIMEOUT)
+            sock.connect(str(path))
+            sock.sendall(json.dumps(request).encode() + b"\n")
+            with sock.makefile("rb") as reader:
+                line = reader.readline()
+    except OSError:
+        # A stale socket file, or a server that is gone or busy
+        return None
+    return json.loads(line) if line else None
+
+
+class IndexServer:
+    """One open index answering JSON requests, reopened after a re-index."""
+
+    def __init__(self, source: Path, index: Path):
+        from jedidb import JediDB
+
+        self.source = source
+        self.index = index
+        self.jedidb = JediDB.open_readonly(source=source, index=index)
+        try:
+            self.generation = _generation(self.jedidb)
+        except BaseException:
+            self.jedidb.close()
+            raise
+
+    def answer(self, line: str | bytes) -> str:
+        """Answer one JSON request line with one JSON response line (no newline)."""
+        from jedidb import JediDB
+
+        try:
+            request = json.loads(line)
+            handler = HANDLERS.get(request.get("command"))
+            if handler is None:
+                response = {"error": f"Unknown command: {request.get('command')}"}
+            else:
+                current = _generation(self.jedidb)
+                if current != self.generation:
+                    # Swap only once the new index is open; if opening
+                    # fails, the old instance stays valid and the reopen
+                    # is retried on the next request
+                    reopened = JediDB.open_readonly(source=self.source, index=self.index)
+                    self.jedidb.close()
+                    self.jedidb, self.generation = reopened, current
+                response = handler(self.jedidb, request)
+        except KeyError as e:
+            response = {"error": f"Missing field: {e}"}
+        except Exception as e:
+            response = {"error": str(e)}
+        return format_data_jsonl([response])
+
+    def close(self):
+        self.jedidb.close()
+
+
+def _serve_stdio(server: IndexServer):
+    """Answer requests from stdin on stdout until stdin closes."""
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        sys.stdout.write(server.answer(line) + "\n")
+        sys.stdout.flush()
+
+
+def _serve_socket(server: IndexServer, listener: socket.socket):
+    """Answer clients of a listening socket, one connection at a time, until
+    the listener is shut down.
+
+    Connections are handled in turn on this thread, so the database
+    connection is never shared between threads.
+    """
+    while True:
+        try:
+            conn, _ = listener.accept()
+        except OSError:
+            return
+        conn.settimeout(SERVER_TIMEOUT)
+        try:
+            with conn, conn.makefile("rb") as reader, conn.makefile("wb") as writer:
+                for line in reader:
+                    if line.strip():
+                        writer.write(server.answer(line).encode() + b"\n")
+                        writer.flush()
+        except OSError:
+            # A client that hung up or stalled only loses its own connection
+            pass
+
+
+def serve_cmd(
+    ctx: typer.Context,
+    stdio: bool = typer.Option(
+        False,
+        "--stdio",
+        help="Answer requests on stdin/stdout instead of a socket",
+    ),
+):
+    """Keep one index open and answer search and show requests from it.
+
+    Listens on a unix socket (in $XDG_RUNTIME_DIR, or the temp directory)
+    until interrupted. While it runs, 'jedidb search' and 'jedidb show' for
+    the same index send their queries to it instead of opening the index
+    themselves; without a server they open it as usual. The index is
+    reopened automatically after a re-index.
+
+    With --stdio, requests are read from stdin instead, one JSON object per
+    line, with one JSON response per line on stdout:
+
+        {"command": "search", "query": "parse", "type": "function",
+         "limit": 20, "private": false, "fast": false}
+
+        {"command": "show", "name": "Model.save", "refs": true}
+
+    Responses are {"results": [...]} for search, the 'show -f json' object
+    for show, or {"error": "..."}.
+
+    Examples:
+
+        jedidb serve &                    # later searches skip opening the index
+
+        echo '{"command": "search", "query": "get", "fast": true}' | jedidb serve --stdio
+    """
+    source = get_source_path(ctx)
+    index = get_index_path(ctx)
+
+    path = socket_path(index)
+    if not stdio:
+        if not hasattr(socket, "AF_UNIX"):
+            print_error("Unix sockets are not available here; use --stdio")
+            raise typer.Exit(1)
+        # Any answer, even an error, means another server owns the socket
+        if request_server(index, {"command": "ping"}) is not None:
+            print_error(f"A server is already running on {path}")
+            raise typer.Exit(1)
+
+    try:
+        server = IndexServer(source, index)
+    except Exception as e:
+        print_error(f"Failed to open database: {e}")
+        raise typer.Exit(1)
+
+    try:
+        if stdio:
+            _serve_stdio(server)
+            return
+
+        # A socket file left by a server that did not exit cleanly
+        path.unlink(missing_ok=True)
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as listener:
+            listener.bind(str(path))
+            try:
+                os.chmod(path, 0o600)
+                listener.listen()
+                print_info(f"Serving {index} on {path}")
+                _serve_socket(server, listener)
+            except KeyboardInterrupt:
+                pass
+            finally:
+                path.unlink(missing_ok=True)
+    finally:
+        server.close()
@@ -4,7 +4,6 @@ from typing import Optional
 
 import typer
 
-from jedidb import JediDB
 from jedidb.cli.formatters import (
     get_source_path,
     get_index_path,
@@ -16,6 +15,59 @@ from jedidb.cli.formatters import (
 )
 
 
+def show_data(definition, references: list | None = None) -> dict:
+    """JSON-ready dict for a definition and, if given, its references."""
+    data = {
+        "definition": {
+            "id": definition.id,
+            "name": definition.name,
+            "full_name": definition.full_name,
+            "type": definition.type,
+            "file": definition.file_path,
+            "line": definition.line,
+            "column": definition.column,
+            "signature": definition.signature,
+            "docstring": definition.docstring,
+            "is_public": definition.is_public,
+        }
+    }
+    if references is not None:
+        data["references"] = [
+            {
+                "file": r.file_path,
+                "line": r.line,
+                "column": r.column,
+                "context": r.context,
+            }
+            for r in references
+        ]
+    return data
+
+
+def show_from_data(data: dict) -> tuple:
+    """Rebuild (definition, references) from a show_data dict."""
+    from jedidb.core.models import Definition, Reference
+
+    d = data["definition"]
+    definition = Definition(
+        id=d["id"],
+        name=d["name"],
+        full_name=d["full_name"],
+        type=d["type"],
+        file_path=d["file"],
+        line=d["line"],
+        column=d["column"],
+        signature=d["signature"],
+        docstring=d["docstring"],
+        is_public=d["is_public"],
+    )
+    references = [
+        Reference(file_path=r["file"], line=r["line"], column=r["column"], context=r["context"])
+        for r in data.get("references", [])
+    ]
+    return definition, references
+
+
 def show_cmd(
     ctx: typer.Context,
     name: str = typer.Argument(
@@ -48,54 +100,41 @@ def show_cmd(
 
         jedidb show Model.save -f json   # JSON output for scripting
     """
+    from jedidb import JediDB
+    from jedidb.cli.commands.serve import request_server
+
     source = get_source_path(ctx)
     index = get_index_path(ctx)
 
-    try:
-        jedidb = JediDB(source=source, index=index)
-    except Exception as e:
-        print_error(f"Failed to open database: {e}")
-        raise typer.Exit(1)
+    # A running 'jedidb serve' answers from its open index; otherwise, or if
+    # it fails, the index is opened here
+    response = request_server(index, {"command": "show", "name": name, "refs": refs})
+    if response is not None and "definition" in response:
+        definition, references = show_from_data(response)
+    else:
+        try:
+            jedidb = JediDB.open_readonly(source=source, index=index)
+        except Exception as e:
+            print_error(f"Failed to open database: {e}")
+            raise typer.Exit(1)
 
-    try:
-        definition = jedidb.search_engine.get_definition(name)
+        try:
+            definition = jedidb.search_engine.get_definition(name)
 
-        if not definition:
-            print_error(f"Definition not found: {name}")
-            raise typer.Exit(1)
+            if not definition:
+                print_error(f"Definition not found: {name}")
+                raise typer.Exit(1)
 
-        references = []
-        if refs:
-            references = jedidb.search_engine.find_references(definition.full_name or definition.name)
-    finally:
-        jedidb.close()
+            references = []
+            if refs:
+                references = jedidb.search_engine.find_references(
+                    definition.full_name or definition.name
+                )
+        finally:
+            jedidb.close()
 
     if output_format == "json":
-        data = {
-            "definition": {
-                "id": definition.id,
-                "name": definition.name,
-                "full_name": definition.full_name,
-                "type": definition.type,
-                "file": definition.file_path,
-                "line": definition.line,
-                "column": definition.column,
-                "signature": definition.signature,
-                "docstring": definition.docstring,
-                "is_public": definition.is_public,
-            }
-        }
-        if refs:
-            data["references"] = [
-                {
-                    "file": r.file_path,
-                    "line": r.line,
-                    "column": r.column,
-                    "context": r.context,
-                }
-                for r in references
-            ]
-        print(format_json(data))
+        print(format_json(show_data(definition, references if refs else None)))
     else:
         print(format_definition_detail(definition))
 
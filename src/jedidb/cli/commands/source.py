@@ -1,16 +1,16 @@
 """Source command for JediDB CLI."""
 
-import json
+from itertools import islice
 from pathlib import Path
 from typing import Optional
 
 import typer
 
-from jedidb import JediDB
 from jedidb.cli.formatters import (
     get_source_path,
     get_index_path,
     format_json,
+    format_data_jsonl,
     format_source_block,
     resolve_output_format,
     write_output,
@@ -98,6 +98,12 @@ def source_cmd(
     if not name and id is None:
         print_error("Must provide either NAME argument or --id option")
         raise typer.Exit(1)
+    if all_matches and not name:
+        print_error("--all requires a NAME argument")
+        raise typer.Exit(1)
+
+    # Imported only once the arguments are valid: JediDB pulls in DuckDB
+    from jedidb import JediDB
 
     output_format = resolve_output_format(output_format, output)
 
@@ -105,7 +111,7 @@ def source_cmd(
     index = get_index_path(ctx)
 
     try:
-        jedidb = JediDB(source=source_root, index=index)
+        jedidb = JediDB.open_readonly(source=source_root, index=index)
     except Exception as e:
         print_error(f"Failed to open database: {e}")
         raise typer.Exit(1)
@@ -113,9 +119,6 @@ def source_cmd(
     try:
         # Handle --all: list all matching definitions
         if all_matches:
-            if not name:
-                print_error("--all requires a NAME argument")
-                raise typer.Exit(1)
             _list_all_definitions(jedidb, name, output_format, output)
             raise typer.Exit(0)
 
@@ -154,6 +157,10 @@ def _resolve_file_path(file_path: str | None, source_root: Path) -> Path | None:
     return source_root / path
 
 
+# Keys for each row of the --all listing, in query column order
+_LIST_FIELDS = ("id", "name", "full_name", "type", "file", "line", "end_line", "size")
+
+
 def _list_all_definitions(jedidb, name: str, output_format: OutputFormat, output: Path | None):
     """List all definitions matching a name (including imports)."""
     query = """
@@ -172,24 +179,12 @@ def _list_all_definitions(jedidb, name: str, output_format: OutputFormat, output
         print_info(f"No definitions found matching: {name}")
         return
 
-    data = [
-        {
-            "id": r[0],
-            "name": r[1],
-            "full_name": r[2],
-            "type": r[3],
-            "file": r[4],
-            "line": r[5],
-            "end_line": r[6],
-            "size": r[7],
-        }
-        for r in results
-    ]
-
-    if output_format == OutputFormat.json:
-        content = format_json(data)
-    elif output_format == OutputFormat.jsonl:
-        content = "\n".join(json.dumps(d, separators=(",", ":")) for d in data)
+    if output_format in (OutputFormat.json, OutputFormat.jsonl):
+        data = [dict(zip(_LIST_FIELDS, r)) for r in results]
+        if output_format == OutputFormat.json:
+            content = format_json(data)
+        else:
+            content = format_data_jsonl(data)
     else:
         # Table format
         lines = [f"Definitions matching '{name}':", ""]
@@ -213,24 +208,43 @@ def _read_source_lines(
     start_line: int,
     end_line: int | None,
     context: int,
+    file_cache: dict[Path, list[str] | None] | None = None,
 ) -> tuple[list[str], int, int]:
     """Read source lines from a file with context.
 
+    Pass the same file_cache for every site in one listing so each file
+    is read once, however many call sites or references it holds. Without
+    a cache only the lines up to the end of the window are read.
+
     Returns:
         Tuple of (lines, actual_start_line, actual_end_line)
     """
-    try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            all_lines = f.readlines()
-    except (OSError, UnicodeDecodeError):
-        return [], start_line, start_line
-
     # Calculate actual line range
     actual_start = max(1, start_line - context)
-    if end_line is not None:
-        actual_end = min(len(all_lines), end_line + context)
+    actual_end = (end_line if end_line is not None else start_line) + context
+
+    if file_cache is None:
+        try:
+            with open(file_path, encoding="utf-8") as f:
+                lines = list(islice(f, actual_start - 1, actual_end))
+        except (OSError, UnicodeDecodeError):
+            return [], start_line, start_line
+        # islice stops at EOF, which clamps the window to the file
+        return lines, actual_start, actual_start + len(lines) - 1
+
+    if file_path in file_cache:
+        all_lines = file_cache[file_path]
     else:
-        actual_end = min(len(all_lines), start_line + context)
+        try:
+            with open(file_path, encoding="utf-8") as f:
+                all_lines = f.readlines()
+        except (OSError, UnicodeDecodeError):
+            all_lines = None
+        file_cache[file_path] = all_lines
+    if all_lines is None:
+        return [], start_line, start_line
+
+    actual_end = min(len(all_lines), actual_end)
 
     # Extract lines (convert to 0-indexed)
     lines = all_lines[actual_start - 1 : actual_end]
@@ -286,7 +300,7 @@ def _show_definition(
             "end_line": definition.end_line,
             "source": "".join(lines),
         }
-        content = json.dumps(data, separators=(",", ":"))
+        content = format_data_jsonl([data])
     else:
         # Table format
         output_lines = [f"{definition.full_name or definition.name}"]
@@ -348,9 +362,13 @@ def _show_calls(
 def _format_calls_json(results, source_root: Path, context: int) -> str:
     """Format calls as JSON."""
     calls = []
+    file_cache = {}
     for r in results:
         file_path = _resolve_file_path(r[2], source_root)
-        lines, start, end = _read_source_lines(file_path, r[3], None, context) if file_path else ([], 0, 0)
+        if file_path:
+            lines, start, end = _read_source_lines(file_path, r[3], None, context, file_cache)
+        else:
+            lines, start, end = [], 0, 0
         calls.append({
             "callee_full_name": r[0],
             "callee_name": r[1],
@@ -369,31 +387,35 @@ def _format_calls_json(results, source_root: Path, context: int) -> str:
 
 def _format_calls_jsonl(results, source_root: Path, context: int) -> str:
     """Format calls as JSONL."""
-    output_lines = []
+    calls = []
+    file_cache = {}
     for r in results:
         file_path = _resolve_file_path(r[2], source_root)
-        lines, _, _ = _read_source_lines(file_path, r[3], None, context) if file_path else ([], 0, 0)
-        data = {
+        if file_path:
+            lines, _, _ = _read_source_lines(file_path, r[3], None, context, file_cache)
+        else:
+            lines, _, _ = [], 0, 0
+        calls.append({
             "callee_full_name": r[0],
             "callee_name": r[1],
             "file": r[2],
             "line": r[3],
             "source": "".join(lines),
-        }
-        output_lines.append(json.dumps(data, separators=(",", ":")))
-    return "\n".join(output_lines)
+        })
+    return format_data_jsonl(calls)
 
 
 def _format_calls_table(results, source_root: Path, context: int, definition) -> str:
     """Format calls as table."""
     output_lines = [f"Calls from {definition.full_name}:", ""]
 
+    file_cache = {}
     for r in results:
         file_path = _resolve_file_path(r[2], source_root)
-        if not file_path or not file_path.exists():
+        if not file_path:
             continue
 
-        lines, start, _ = _read_source_lines(file_path, r[3], None, context)
+        lines, start, _ = _read_source_lines(file_path, r[3], None, context, file_cache)
         if lines:
             output_lines.append(f"{r[2]}:{r[3]}")
             output_lines.append(format_source_block(lines, start))
@@ -431,9 +453,13 @@ def _show_refs(
 def _format_refs_json(references, source_root: Path, context: int) -> str:
     """Format references as JSON."""
     refs = []
+    file_cache = {}
     for r in references:
         file_path = _resolve_file_path(r.file_path, source_root)
-        lines, start, end = _read_source_lines(file_path, r.line, None, context) if file_path else ([], 0, 0)
+        if file_path:
+            lines, start, end = _read_source_lines(file_path, r.line, None, context, file_cache)
+        else:
+            lines, start, end = [], 0, 0
         refs.append({
             "file": r.file_path,
             "line": r.line,
@@ -450,29 +476,33 @@ def _format_refs_json(references, source_root: Path, context: int) -> str:
 
 def _format_refs_jsonl(references, source_root: Path, context: int) -> str:
     """Format references as JSONL."""
-    output_lines = []
+    refs = []
+    file_cache = {}
     for r in references:
         file_path = _resolve_file_path(r.file_path, source_root)
-        lines, _, _ = _read_source_lines(file_path, r.line, None, context) if file_path else ([], 0, 0)
-        data = {
+        if file_path:
+            lines, _, _ = _read_source_lines(file_path, r.line, None, context, file_cache)
+        else:
+            lines, _, _ = [], 0, 0
+        refs.append({
             "file": r.file_path,
             "line": r.line,
             "source": "".join(lines),
-        }
-        output_lines.append(json.dumps(data, separators=(",", ":")))
-    return "\n".join(output_lines)
+        })
+    return format_data_jsonl(refs)
 
 
 def _format_refs_table(references, source_root: Path, context: int, definition) -> str:
     """Format references as table."""
     output_lines = [f"References to {definition.full_name or definition.name}:", ""]
 
+    file_cache = {}
     for r in references:
         file_path = _resolve_file_path(r.file_path, source_root)
-        if not file_path or not file_path.exists():
+        if not file_path:
             continue
 
-        lines, start, _ = _read_source_lines(file_path, r.line, None, context)
+        lines, start, _ = _read_source_lines(file_path, r.line, None, context, file_cache)
         if lines:
             output_lines.append(f"{r.file_path}:{r.line}")
             output_lines.append(format_source_block(lines, start))
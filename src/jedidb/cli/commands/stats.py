@@ -2,7 +2,6 @@
 
 import typer
 
-from jedidb import JediDB
 from jedidb.cli.formatters import get_source_path, get_index_path, format_stats, format_json, print_error
 
 
@@ -19,11 +18,13 @@ def stats_cmd(
 
     Display counts and summaries of indexed data.
     """
+    from jedidb import JediDB
+
     source = get_source_path(ctx)
     index = get_index_path(ctx)
 
     try:
-        jedidb = JediDB(source=source, index=index)
+        jedidb = JediDB.open_readonly(source=source, index=index)
     except Exception as e:
         print_error(f"Failed to open database: {e}")
         raise typer.Exit(1)
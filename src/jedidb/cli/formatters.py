@@ -1,16 +1,28 @@
 """Output formatters for CLI."""
 
+import codecs
 import csv
 import io
 import json
+import os
 import sys
 from enum import Enum
+from functools import cache, lru_cache
+from json.encoder import encode_basestring_ascii
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any, TextIO
 
 import typer
 
-from jedidb.core.models import Definition, Reference, SearchResult
+try:
+    import orjson
+except ImportError:  # optional, see the "fast" extra
+    orjson = None
+
+# Models are only needed for annotations; importing them at runtime would
+# load dataclasses and datetime for every command, including --help
+if TYPE_CHECKING:
+    from jedidb.core.models import Definition, Reference, SearchResult
 
 
 class OutputFormat(str, Enum):
@@ -21,9 +33,19 @@ class OutputFormat(str, Enum):
     csv = "csv"
 
 
+@lru_cache(maxsize=8)
+def is_terminal(stream: TextIO) -> bool:
+    """Whether stream is a terminal, checked once per stream object.
+
+    Keyed on the stream rather than cached at import, so a replaced
+    sys.stdout or sys.stderr (redirection, test runners) is checked afresh.
+    """
+    return stream.isatty()
+
+
 def get_default_format() -> OutputFormat:
     """Return 'table' for interactive terminals, 'jsonl' for pipes/redirects."""
-    return OutputFormat.table if sys.stdout.isatty() else OutputFormat.jsonl
+    return OutputFormat.table if is_terminal(sys.stdout) else OutputFormat.jsonl
 
 
 def get_format_from_extension(path: Path) -> OutputFormat | None:
@@ -51,36 +73,233 @@ def resolve_output_format(
     return get_default_format()
 
 
-def format_data_json(data: list[dict]) -> str:
-    """Format list of dicts as pretty JSON."""
+# orjson options matching json.dumps(..., default=str): datetimes and
+# non-string keys go through str() instead of orjson's native handling
+_ORJSON_OPTIONS = 0 if orjson is None else orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+
+# orjson rejects integers beyond 64 bits (DuckDB HUGEINT/UHUGEINT), which
+# the stdlib encoder accepts
+_ORJSON_ERRORS = () if orjson is None else (TypeError, orjson.JSONEncodeError)
+
+
+# orjson writes non-ASCII text as UTF-8. It only occurs inside strings, so
+# encoding the output to ASCII with this error handler escapes it exactly as
+# json.dumps does, in one pass over the text.
+_JSON_ESCAPE_ERRORS = "jedidb.jsonescape"
+
+
+def _escape_non_ascii(error: UnicodeEncodeError) -> tuple[str, int]:
+    """Codec error handler: escape a run of non-ASCII characters as \\u sequences."""
+    return encode_basestring_ascii(error.object[error.start:error.end])[1:-1], error.end
+
+
+codecs.register_error(_JSON_ESCAPE_ERRORS, _escape_non_ascii)
+
+
+def _ascii_json(encoded: bytes) -> bytes:
+    """orjson output with non-ASCII text escaped as by json.dumps.
+
+    Pure ASCII output, the common case, is returned without a second pass.
+    """
+    if encoded.isascii():
+        return encoded
+    return encoded.decode().encode("ascii", _JSON_ESCAPE_ERRORS)
+
+
+def _orjson_json(data, indent: bool = False) -> bytes:
+    """Encode data with orjson, as ASCII."""
+    option = _ORJSON_OPTIONS | orjson.OPT_INDENT_2 if indent else _ORJSON_OPTIONS
+    return _ascii_json(orjson.dumps(data, default=str, option=option))
+
+
+def _orjson_jsonl(data: list[dict]) -> bytes:
+    """Encode rows with orjson as JSON lines, without a trailing newline, as ASCII."""
+    dumps = orjson.dumps
+    lines = [dumps(row, default=str, option=_ORJSON_OPTIONS) for row in data]
+    return _ascii_json(b"\n".join(lines))
+
+
+def format_data_json(data: list[dict] | dict) -> str:
+    """Format list of dicts (or a single dict) as pretty JSON.
+
+    The output is ASCII, with non-ASCII text as \\u escapes, whether or not
+    orjson is installed. orjson writes some floats differently from the
+    stdlib (1e16 rather than 1e+16); both parse to the same value.
+    """
+    if orjson is not None:
+        try:
+            return _orjson_json(data, indent=True).decode()
+        except _ORJSON_ERRORS:
+            pass
     return json.dumps(data, indent=2, default=str)
 
 
 def format_data_jsonl(data: list[dict]) -> str:
-    """Format list of dicts as newline-delimited JSON."""
-    return "\n".join(json.dumps(row, separators=(",", ":"), default=str) for row in data)
+    """Format list of dicts as newline-delimited JSON.
 
+    Encoded as in format_data_json.
+    """
+    if orjson is not None:
+        try:
+            return _orjson_jsonl(data).decode()
+        except _ORJSON_ERRORS:
+            pass
+    return _stdlib_jsonl(data)
 
-def format_data_csv(data: list[dict], columns: list[str] | None = None) -> str:
-    """Format list of dicts as CSV using csv module.
 
-    Args:
-        data: List of dictionaries to format
-        columns: Column order (uses first row's keys if not specified)
-    """
-    if not data:
-        return ""
+def _stdlib_jsonl(data: list[dict]) -> str:
+    """JSON lines from the stdlib encoder, without a trailing newline."""
+    return "\n".join(json.dumps(row, separators=(",", ":"), default=str) for row in data)
 
-    if columns is None:
-        columns = list(data[0].keys())
 
+def format_rows_csv(columns: list[str], rows: list[tuple]) -> str:
+    """Format row tuples as CSV, without building a dict per row."""
     output = io.StringIO()
-    writer = csv.DictWriter(output, fieldnames=columns, extrasaction="ignore")
-    writer.writeheader()
-    writer.writerows(data)
+    writer = csv.writer(output)
+    writer.writerow(columns)
+    writer.writerows(rows)
     return output.getvalue().rstrip("\n")
 
 
+# Rows fetched from DuckDB per round-trip when streaming output
+FETCH_BATCH_SIZE = 8192
+
+# Buffer size for output files written by the streaming writers, so each
+# batch reaches the disk in a few large writes
+OUTPUT_BUFFER_SIZE = 1 << 20
+
+
+class PrefetchedResult:
+    """A DuckDB result with its first batch fetched, so emptiness is known
+    before any output is written.
+
+    Streaming writers read it through fetchmany like the result itself.
+    """
+
+    def __init__(self, result, size: int = FETCH_BATCH_SIZE):
+        self._result = result
+        self._first = result.fetchmany(size)
+        self.has_rows = bool(self._first)
+
+    def fetchmany(self, size: int) -> list[tuple]:
+        if self._first is not None:
+            rows, self._first = self._first, None
+            return rows
+        return self._result.fetchmany(size)
+
+    def fetchall(self) -> list[tuple]:
+        rows = self.fetchmany(FETCH_BATCH_SIZE)
+        return rows + self._result.fetchall() if rows else rows
+
+
+def _binary_stream(fh: TextIO):
+    """The byte stream under fh, if orjson's ASCII bytes can be written to it as-is."""
+    if orjson is None or os.linesep != "\n":
+        return None
+    encoding = (getattr(fh, "encoding", None) or "").lower().replace("-", "")
+    if encoding != "utf8":
+        return None
+    return getattr(fh, "buffer", None)
+
+
+def write_data_json(fh: TextIO, columns: list[str], result) -> int:
+    """Stream a DuckDB result as a pretty JSON array of objects.
+
+    The text matches format_data_json, but rows are fetched and written in
+    batches instead of being collected into a list of dicts first. With
+    orjson and a UTF-8 stream, the encoded bytes go straight to the
+    underlying buffer without a decode/encode round-trip.
+
+    Returns:
+        Number of rows written
+    """
+    count = 0
+    out = _binary_stream(fh)
+    if out is not None:
+        fh.flush()
+        while rows := result.fetchmany(FETCH_BATCH_SIZE):
+            # Drop each batch's enclosing "[\n" and "\n]" so batches splice
+            # into one array. A batch orjson cannot encode (integers beyond
+            # 64 bits) is encoded by the stdlib, to the same text.
+            data = [dict(zip(columns, row)) for row in rows]
+            try:
+                batch = _orjson_json(data, indent=True)
+            except _ORJSON_ERRORS:
+                batch = json.dumps(data, indent=2, default=str).encode()
+            out.write(b",\n" if count else b"[\n")
+            out.write(memoryview(batch)[2:-2])
+            count += len(rows)
+        out.write(b"\n]\n" if count else b"[]\n")
+        out.flush()
+        return count
+
+    while rows := result.fetchmany(FETCH_BATCH_SIZE):
+        # Encode the whole batch in one call, then splice as above
+        batch = format_data_json([dict(zip(columns, row)) for row in rows])
+        fh.write(",\n" if count else "[\n")
+        fh.write(batch[2:-2])
+        count += len(rows)
+    fh.write("\n]\n" if count else "[]\n")
+    return count
+
+
+def write_data_jsonl(fh: TextIO, columns: list[str], result) -> int:
+    """Stream a DuckDB result as newline-delimited JSON, one batch per write.
+
+    The text matches format_data_jsonl. As in write_data_json, orjson bytes
+    go straight to a UTF-8 stream's buffer when possible, with the stdlib
+    encoding any batch orjson cannot.
+
+    Returns:
+        Number of rows written
+    """
+    count = 0
+    out = _binary_stream(fh)
+    if out is not None:
+        fh.flush()
+        while rows := result.fetchmany(FETCH_BATCH_SIZE):
+            data = [dict(zip(columns, row)) for row in rows]
+            try:
+                batch = _orjson_jsonl(data)
+            except _ORJSON_ERRORS:
+                batch = _stdlib_jsonl(data).encode()
+            out.write(batch)
+            out.write(b"\n")
+            count += len(rows)
+        out.flush()
+        return count
+
+    while rows := result.fetchmany(FETCH_BATCH_SIZE):
+        fh.write(format_data_jsonl([dict(zip(columns, row)) for row in rows]) + "\n")
+        count += len(rows)
+    return count
+
+
+def write_data_csv(fh: TextIO, columns: list[str], result) -> int:
+    """Stream a DuckDB result as CSV with a header row.
+
+    Each batch is formatted into a buffer and written with one call, so a
+    line-buffered stream (a terminal) is not flushed once per row.
+
+    Returns:
+        Number of rows written
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    count = 0
+    while rows := result.fetchmany(FETCH_BATCH_SIZE):
+        writer.writerows(rows)
+        fh.write(buffer.getvalue())
+        buffer.seek(0)
+        buffer.truncate()
+        count += len(rows)
+    if not count:
+        fh.write(buffer.getvalue())
+    return count
+
+
 def write_output(
     content: str,
     output_path: Path | None,
@@ -113,7 +332,7 @@ def get_index_path(ctx: typer.Context) -> Path:
     return ctx.obj["index"]
 
 
-def format_definition_table(definitions: list[Definition], show_file: bool = True) -> str:
+def format_definition_table(definitions: "list[Definition]", show_file: bool = True) -> str:
     """Format definitions as a plain text table."""
     if not definitions:
         return "No definitions found."
@@ -133,7 +352,7 @@ def format_definition_table(definitions: list[Definition], show_file: bool = Tru
     return "\n".join(lines)
 
 
-def format_search_results_table(results: list[SearchResult]) -> str:
+def format_search_results_table(results: "list[SearchResult]") -> str:
     """Format search results as a plain text table."""
     if not results:
         return "No results found."
@@ -150,7 +369,7 @@ def format_search_results_table(results: list[SearchResult]) -> str:
     return "\n".join(lines)
 
 
-def format_references_table(references: list[Reference]) -> str:
+def format_references_table(references: "list[Reference]") -> str:
     """Format references as a plain text table."""
     if not references:
         return "No references found."
@@ -164,7 +383,7 @@ def format_references_table(references: list[Reference]) -> str:
     return "\n".join(lines)
 
 
-def format_definition_detail(definition: Definition) -> str:
+def format_definition_detail(definition: "Definition") -> str:
     """Format a single definition with full details."""
     lines = []
 
@@ -212,22 +431,19 @@ def format_stats(stats: dict[str, Any]) -> str:
 
 def format_json(data: Any) -> str:
     """Format data as JSON."""
-    return json.dumps(data, indent=2, default=str)
+    return format_data_json(data)
 
 
-def format_csv_row(row: dict[str, Any], columns: list[str]) -> str:
-    """Format a dictionary as a CSV row."""
-    values = []
-    for col in columns:
-        val = row.get(col, "")
-        # Escape quotes and wrap in quotes if contains comma
-        if isinstance(val, str):
-            if '"' in val or "," in val or "\n" in val:
-                val = '"' + val.replace('"', '""') + '"'
-        else:
-            val = str(val) if val is not None else ""
-        values.append(val)
-    return ",".join(values)
+@cache
+def get_stderr_console():
+    """Shared Rich console on stderr, created (and Rich imported) on first use.
+
+    The console looks up sys.stderr when it writes, so one instance serves
+    every command in the process.
+    """
+    from rich.console import Console
+
+    return Console(stderr=True)
 
 
 def print_success(message: str):
@@ -267,11 +483,11 @@ def format_source_block(lines: list[str], start_line: int) -> str:
     max_line = start_line + len(lines) - 1
     width = len(str(max_line))
 
+    # str.rjust pads to the dynamic width without a per-line format spec
     formatted = []
-    for i, line in enumerate(lines):
-        line_num = start_line + i
+    for line_num, line in enumerate(lines, start_line):
         # Strip trailing newline if present
         line_content = line.rstrip("\n\r")
-        formatted.append(f"{line_num:>{width}} | {line_content}")
+        formatted.append(f"{str(line_num).rjust(width)} | {line_content}")
 
     return "\n".join(formatted)
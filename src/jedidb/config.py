@@ -1,8 +1,23 @@
 """Configuration management for JediDB."""
 
+import os
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-import tomllib
+
+
+@lru_cache(maxsize=16)
+def _read_config(path: str, mtime_ns: int, size: int) -> tuple[tuple[str, ...], tuple[str, ...]]:
+    """Parse config.toml into (include, exclude) patterns.
+
+    Keyed on the file's mtime and size as well as its path, so an edited
+    config is parsed again while repeated loads in one process are not.
+    """
+    import tomllib
+
+    with open(path, "rb") as f:
+        data = tomllib.load(f)
+    return tuple(data.get("include", [])), tuple(data.get("exclude", []))
 
 
 @dataclass
@@ -22,12 +37,10 @@ class Config:
         Returns:
             Config instance with loaded patterns
         """
-        config_file = index_path / "config.toml"
-        if config_file.exists():
-            with open(config_file, "rb") as f:
-                data = tomllib.load(f)
-            return cls(
-                include_patterns=data.get("include", []),
-                exclude_patterns=data.get("exclude", []),
-            )
-        return cls()
+        config_file = os.path.join(index_path, "config.toml")
+        try:
+            st = os.stat(config_file)
+        except FileNotFoundError:
+            return cls()
+        include, exclude = _read_config(config_file, st.st_mtime_ns, st.st_size)
+        return cls(include_patterns=list(include), exclude_patterns=list(exclude))
@@ -1,16 +1,38 @@
 """Core components for JediDB."""
 
-from jedidb.core.database import Database
-from jedidb.core.analyzer import Analyzer
-from jedidb.core.indexer import Indexer
-from jedidb.core.search import SearchEngine
-from jedidb.core.models import (
-    FileRecord,
-    Definition,
-    Reference,
-    Import,
-    SearchResult,
-)
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from jedidb.core.analyzer import Analyzer
+    from jedidb.core.database import Database
+    from jedidb.core.indexer import Indexer
+    from jedidb.core.models import Definition, FileRecord, Import, Reference, SearchResult
+    from jedidb.core.search import SearchEngine
+
+# Loaded on first access, so importing a light submodule such as
+# jedidb.core.models does not pull in DuckDB (Database, SearchEngine) or
+# Jedi (Analyzer, Indexer)
+_LAZY_IMPORTS = {
+    "Database": "jedidb.core.database",
+    "SearchEngine": "jedidb.core.search",
+    "Analyzer": "jedidb.core.analyzer",
+    "Indexer": "jedidb.core.indexer",
+    "FileRecord": "jedidb.core.models",
+    "Definition": "jedidb.core.models",
+    "Reference": "jedidb.core.models",
+    "Import": "jedidb.core.models",
+    "SearchResult": "jedidb.core.models",
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_IMPORTS:
+        value = getattr(importlib.import_module(_LAZY_IMPORTS[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     "Database",
@@ -1,8 +1,11 @@
 """DuckDB database management for JediDB."""
 
 import logging
+import os
+import re
 from contextlib import contextmanager
 from datetime import datetime
+from importlib.resources import files
 from pathlib import Path
 from typing import Any
 
@@ -135,6 +138,15 @@ CREATE INDEX IF NOT EXISTS idx_calls_callee_name ON calls(callee_name);
 CREATE INDEX IF NOT EXISTS idx_calls_caller_order ON calls(caller_full_name, call_order);
 """
 
+TABLES = ["files", "definitions", "refs", "imports", "decorators", "class_bases", "calls"]
+
+# Indexes created on tables loaded from parquet or the native snapshot, for
+# the point lookups behind `calls` and reference queries
+LOADED_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_calls_caller_order ON calls(caller_full_name, call_order)",
+    "CREATE INDEX IF NOT EXISTS idx_refs_target_full_name ON refs(target_full_name)",
+]
+
 FTS_SETUP_SQL = """
 -- Install and load FTS extension
 INSTALL fts;
@@ -142,6 +154,19 @@ LOAD fts;
 """
 
 
+def _run_sql_script(conn: duckdb.DuckDBPyConnection, name: str):
+    """Run a SQL script shipped with the package, one statement at a time.
+
+    DuckDB execute() only runs one statement at a time, so comments are
+    removed and the script is split on semicolons.
+    """
+    script = files("jedidb").joinpath(name).read_text()
+    sql_no_comments = re.sub(r"--.*$", "", script, flags=re.MULTILINE)
+    for stmt in (s.strip() for s in sql_no_comments.split(";")):
+        if stmt:
+            conn.execute(stmt)
+
+
 class Database:
     """DuckDB database connection and operations."""
 
@@ -207,12 +232,14 @@ class Database:
             "PRAGMA create_fts_index('definitions', 'id', 'search_text', stemmer='none', stopwords='none', overwrite=1)"
         )
 
-    def execute(self, sql: str, params: tuple | list | None = None) -> duckdb.DuckDBPyConnection:
+    def execute(
+        self, sql: str, params: tuple | list | dict | None = None
+    ) -> duckdb.DuckDBPyConnection:
         """Execute a SQL query.
 
         Args:
             sql: SQL query string
-            params: Optional query parameters
+            params: Optional query parameters (positional, or a dict for $name parameters)
 
         Returns:
             Query result relation
@@ -286,6 +313,83 @@ class Database:
         self.execute("DELETE FROM definitions WHERE file_id = ?", (file_id,))
         self.execute("DELETE FROM files WHERE id = ?", (file_id,))
 
+    def delete_files(self, file_ids: list[int]):
+        """Delete several files and all related records in one pass per table."""
+        if not file_ids:
+            return
+
+        ids = list(file_ids)
+        self.execute(
+            """
+            DELETE FROM decorators WHERE definition_id IN (
+                SELECT id FROM definitions WHERE file_id IN (SELECT UNNEST(?))
+            )
+            """,
+            (ids,)
+        )
+        self.execute(
+            """
+            DELETE FROM class_bases WHERE class_id IN (
+                SELECT id FROM definitions WHERE file_id IN (SELECT UNNEST(?)) AND type = 'class'
+            )
+            """,
+            (ids,)
+        )
+        for table in ("calls", "refs", "imports", "definitions"):
+            self.execute(f"DELETE FROM {table} WHERE file_id IN (SELECT UNNEST(?))", (ids,))
+        self.execute("DELETE FROM files WHERE id IN (SELECT UNNEST(?))", (ids,))
+
+    def delete_files_by_paths(self, paths: list[str]):
+        """Delete files by path and all related records.
+
+        Clears every table at once when the paths cover all indexed files.
+        """
+        result = self.execute(
+            "SELECT id FROM files WHERE path IN (SELECT UNNEST(?::VARCHAR[]))",
+            (list(paths),)
+        ).fetchall()
+        if not result:
+            return
+        if len(result) == self.execute("SELECT COUNT(*) FROM files").fetchone()[0]:
+            self.clear()
+        else:
+            self.delete_files([r[0] for r in result])
+
+    def clear(self):
+        """Remove all indexed data, keeping the schema."""
+        tables = ("decorators", "class_bases", "calls", "refs", "imports", "definitions", "files")
+        for table in tables:
+            self.execute(f"TRUNCATE {table}")
+
+    def delete_missing_files(self, existing_paths: list[str]) -> list[str]:
+        """Delete files whose path is not in existing_paths, with related records.
+
+        The anti-join and cascade run inside DuckDB; only the deleted paths
+        come back to Python.
+
+        Args:
+            existing_paths: Indexed-style paths that are still present on disk
+
+        Returns:
+            Sorted list of deleted file paths
+        """
+        result = self.execute(
+            "DELETE FROM files WHERE path NOT IN (SELECT UNNEST(?::VARCHAR[])) RETURNING path",
+            (list(existing_paths),)
+        ).fetchall()
+        self.delete_orphans()
+        return sorted(r[0] for r in result)
+
+    def delete_orphans(self):
+        """Delete records whose file no longer exists in the files table."""
+        orphan_definitions = """
+            SELECT id FROM definitions WHERE file_id NOT IN (SELECT id FROM files)
+        """
+        self.execute(f"DELETE FROM decorators WHERE definition_id IN ({orphan_definitions})")
+        self.execute(f"DELETE FROM class_bases WHERE class_id IN ({orphan_definitions})")
+        for table in ("calls", "refs", "imports", "definitions"):
+            self.execute(f"DELETE FROM {table} WHERE file_id NOT IN (SELECT id FROM files)")
+
     def delete_file_by_path(self, path: str):
         """Delete a file by path."""
         # Get file id first
@@ -561,7 +665,7 @@ class Database:
 
     def build_call_graph(self):
         """Build call graph from all call references (resolved and unresolved)."""
-        self.execute("DELETE FROM calls")
+        self.execute("TRUNCATE calls")
         # Use window function to pick only the innermost enclosing definition
         # (smallest line range = most specific caller)
         self.execute("""
@@ -608,14 +712,110 @@ class Database:
         output_dir = Path(output_dir)
         output_dir.mkdir(parents=True, exist_ok=True)
 
-        tables = ["files", "definitions", "refs", "imports", "decorators", "class_bases", "calls"]
-        for table in tables:
+        for table in TABLES:
             parquet_path = str(output_dir / f"{table}.parquet").replace("'", "''")
             self.execute(f"""
                 COPY {table} TO '{parquet_path}'
                 (FORMAT PARQUET, COMPRESSION ZSTD, COMPRESSION_LEVEL {compression_level})
             """)
 
+    def write_native(self, db_file: Path):
+        """Write a native DuckDB snapshot of all tables and views.
+
+        The snapshot is written to a temporary file and moved into place, so
+        readers never see a partially written database.
+
+        Args:
+            db_file: Path of the DuckDB file to write
+        """
+        db_file = Path(db_file)
+        tmp_file = db_file.with_name(db_file.name + ".tmp")
+        tmp_file.unlink(missing_ok=True)
+
+        source = self.execute("SELECT current_database()").fetchone()[0]
+        safe_path = str(tmp_file).replace("'", "''")
+        self.execute(f"ATTACH '{safe_path}' AS snapshot")
+        try:
+            for table in TABLES:
+                self.execute(f'CREATE TABLE snapshot.{table} AS SELECT * FROM "{source}".{table}')
+            # Views are created inside the snapshot so they bind to its tables
+            self.execute("USE snapshot")
+            try:
+                for stmt in LOADED_INDEXES:
+                    self.execute(stmt)
+                _run_sql_script(self.conn, "views.sql")
+                self._create_snapshot_fts_index()
+            finally:
+                self.execute(f'USE "{source}"')
+        finally:
+            self.execute("DETACH snapshot")
+
+        os.replace(tmp_file, db_file)
+
+    def _create_snapshot_fts_index(self):
+        """Build the FTS index in the current (snapshot) catalog if FTS is available."""
+        self.init_fts()
+        if not self._fts_available:
+            return
+        try:
+            self.execute(
+                "PRAGMA create_fts_index('definitions', 'id', 'search_text', "
+                "stemmer='none', stopwords='none')"
+            )
+        except duckdb.Error as e:
+            logger.debug("Could not build FTS index in native snapshot: %s", e)
+
+    @classmethod
+    def open_native(cls, db_file: Path) -> "Database":
+        """Open a native DuckDB snapshot (writable in-memory copy of the snapshot file).
+
+        Args:
+            db_file: Path to a DuckDB file written by write_native
+
+        Returns:
+            Database instance with tables and views copied from the snapshot
+        """
+        db_file = Path(db_file).resolve()
+
+        db = cls.__new__(cls)
+        db.db_path = db_file
+        db._conn = duckdb.connect(":memory:")
+        db._fts_initialized = False
+        db._fts_available = True
+
+        safe_path = str(db_file).replace("'", "''")
+        db._conn.execute(f"ATTACH '{safe_path}' AS native (READ_ONLY)")
+        for table in TABLES:
+            db._conn.execute(f"CREATE TABLE {table} AS SELECT * FROM native.{table}")
+        db._conn.execute("DETACH native")
+
+        _run_sql_script(db._conn, "views.sql")
+        db._prepare_loaded_tables()
+        return db
+
+    @classmethod
+    def open_readonly(cls, db_file: Path) -> "Database":
+        """Connect directly to a native DuckDB snapshot in read-only mode.
+
+        Nothing is copied into memory: DuckDB reads pages from the file on
+        demand, so concurrent processes share them through the OS page cache.
+
+        Args:
+            db_file: Path to a DuckDB file written by write_native
+
+        Returns:
+            Read-only Database instance backed by the snapshot file
+        """
+        db = cls.__new__(cls)
+        db.db_path = Path(db_file).resolve()
+        db._conn = duckdb.connect(str(db.db_path), read_only=True)
+        db._fts_initialized = False
+        # The snapshot carries an FTS index only if the extension was available when it was written
+        db._fts_available = bool(db._conn.execute(
+            "SELECT COUNT(*) FROM duckdb_schemas() WHERE schema_name = 'fts_main_definitions'"
+        ).fetchone()[0])
+        return db
+
     @classmethod
     def open_parquet(cls, parquet_dir: Path) -> "Database":
         """Open a parquet-backed database (in-memory with tables from parquet files).
@@ -626,9 +826,6 @@ class Database:
         Returns:
             Database instance with tables loaded from parquet files
         """
-        import re
-        from importlib.resources import files
-
         parquet_dir = Path(parquet_dir).resolve()
 
         # Create in-memory database
@@ -642,16 +839,8 @@ class Database:
         safe_dir = str(parquet_dir).replace("'", "''")
         db._conn.execute(f"SET variable parquet_dir = '{safe_dir}'")
 
-        # Load init.sql from package
-        init_sql = files("jedidb").joinpath("init.sql").read_text()
-
-        # DuckDB execute() only runs one statement at a time
-        # Remove comments and split on semicolons
-        sql_no_comments = re.sub(r"--.*$", "", init_sql, flags=re.MULTILINE)
-        statements = [s.strip() for s in sql_no_comments.split(";") if s.strip()]
-
-        for stmt in statements:
-            db._conn.execute(stmt)
+        # Load tables from the parquet files
+        _run_sql_script(db._conn, "init.sql")
 
         # Handle class_bases table (may not exist in older indexes)
         class_bases_parquet = parquet_dir / "class_bases.parquet"
@@ -671,26 +860,33 @@ class Database:
                 )
             """)
 
+        _run_sql_script(db._conn, "views.sql")
+        db._prepare_loaded_tables()
+        return db
+
+    def _prepare_loaded_tables(self):
+        """Set up sequences, indexes and FTS on tables loaded from storage."""
         # Create sequences for incremental inserts (must be done after loading data)
-        for table in ["files", "definitions", "refs", "imports", "decorators", "class_bases", "calls"]:
-            max_id = db._conn.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table}").fetchone()[0]
-            db._conn.execute(f"CREATE SEQUENCE {table}_id_seq START WITH {max_id + 1}")
-            db._conn.execute(f"ALTER TABLE {table} ALTER COLUMN id SET DEFAULT nextval('{table}_id_seq')")
+        for table in TABLES:
+            max_id = self._conn.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table}").fetchone()[0]
+            self._conn.execute(f"CREATE SEQUENCE {table}_id_seq START WITH {max_id + 1}")
+            self._conn.execute(
+                f"ALTER TABLE {table} ALTER COLUMN id SET DEFAULT nextval('{table}_id_seq')"
+            )
 
-        # Create index for call ordering queries (after ALTER statements to avoid dependency issues)
-        db._conn.execute("CREATE INDEX IF NOT EXISTS idx_calls_caller_order ON calls(caller_full_name, call_order)")
+        # Create lookup indexes (after ALTER statements to avoid dependency issues)
+        for stmt in LOADED_INDEXES:
+            self._conn.execute(stmt)
 
         # Attempt to load FTS extension and create index; fall back to LIKE search if unavailable
         try:
-            db._conn.execute("INSTALL fts")
-            db._conn.execute("LOAD fts")
-            db._conn.execute(
+            self._conn.execute("INSTALL fts")
+            self._conn.execute("LOAD fts")
+            self._conn.execute(
                 "PRAGMA create_fts_index('definitions', 'id', 'search_text', stemmer='none', stopwords='none')"
             )
-            db._fts_initialized = True
+            self._fts_initialized = True
         except duckdb.Error as e:
             logger.debug("FTS extension not available, LIKE search will be used: %s", e)
-            db._fts_initialized = True
-            db._fts_available = False
-
-        return db
+            self._fts_initialized = True
+            self._fts_available = False
@@ -1,6 +1,7 @@
 """File indexing logic for JediDB."""
 
 import logging
+import os
 from pathlib import Path
 from typing import Callable
 
@@ -13,10 +14,12 @@ logger = logging.getLogger("jedidb.indexer")
 from jedidb.core.models import ClassBase, Definition, FileRecord, Import, Reference
 from jedidb.utils import (
     compute_file_hash,
-    discover_python_files,
+    diff_file_hashes,
+    discover_files,
     get_file_modified_time,
     get_file_size,
     normalize_path,
+    normalize_paths,
 )
 
 
@@ -70,36 +73,12 @@ class Indexer:
 
         # Discover current files on disk
         disk_files = self._discover_files(paths, include, exclude, base_path)
-        disk_paths = {normalize_path(f, base_path): f for f in disk_files}
-
-        # Get indexed files from database
-        result = self.db.execute("SELECT path, hash FROM files").fetchall()
-        db_files = {row[0]: row[1] for row in result}
-
-        changed = []
-        added = []
-        removed = []
-
-        # Check for changed and new files
-        for rel_path, abs_path in disk_paths.items():
-            if rel_path in db_files:
-                current_hash = compute_file_hash(abs_path)
-                if current_hash != db_files[rel_path]:
-                    changed.append(rel_path)
-            else:
-                added.append(rel_path)
-
-        # Check for removed files
-        for db_path in db_files:
-            if db_path not in disk_paths:
-                removed.append(db_path)
-
-        return {
-            "is_stale": bool(changed or added or removed),
-            "changed": changed,
-            "added": added,
-            "removed": removed,
-        }
+        return self._check_staleness(disk_files, normalize_paths(disk_files, base_path))
+
+    def _check_staleness(self, disk_files: list[Path], rel_paths: list[str]) -> dict:
+        """Compare already-discovered files against the index (see check_staleness)."""
+        indexed = dict(self.db.execute("SELECT path, hash FROM files").fetchall())
+        return diff_file_hashes(indexed, disk_files, rel_paths)
 
     def index(
         self,
@@ -108,6 +87,7 @@ class Indexer:
         exclude: list[str] | None = None,
         force: bool = False,
         base_path: Path | None = None,
+        files: list[Path] | None = None,
     ) -> dict:
         """Index Python files.
 
@@ -121,6 +101,8 @@ class Indexer:
             exclude: Glob patterns to exclude
             force: Force re-indexing even if no files have changed
             base_path: Base path for relative path storage
+            files: Files already discovered for paths/include/exclude; when
+                given, discovery is skipped
 
         Returns:
             Dictionary with indexing statistics
@@ -129,7 +111,10 @@ class Indexer:
             base_path = self.analyzer.project_path or Path.cwd()
 
         # Discover files to index
-        files_to_index = self._discover_files(paths, include, exclude, base_path)
+        if files is None:
+            files_to_index = self._discover_files(paths, include, exclude, base_path)
+        else:
+            files_to_index = files
 
         stats = {
             "files_indexed": 0,
@@ -145,10 +130,12 @@ class Indexer:
         }
 
         total_files = len(files_to_index)
+        rel_paths = normalize_paths(files_to_index, base_path)
 
-        # Check staleness first (unless force)
+        # Check staleness first (unless force), reusing the discovered files
+        # rather than walking the tree a second time
         if not force:
-            staleness = self.check_staleness(paths, include, exclude, base_path)
+            staleness = self._check_staleness(files_to_index, rel_paths)
             if not staleness["is_stale"]:
                 # Nothing changed, skip indexing entirely
                 stats["files_skipped"] = total_files
@@ -156,19 +143,33 @@ class Indexer:
                 return stats
 
         # Something changed (or force) - do full re-index
-        indexed_paths = set()
+        indexed_paths = set(rel_paths)
+
+        # Hash every file before touching the database: a file that vanished
+        # or became unreadable since discovery keeps its old records
+        hashes = {}
+        for file_path, rel_path in zip(files_to_index, rel_paths):
+            try:
+                hashes[rel_path] = compute_file_hash(file_path)
+            except Exception as e:
+                stats["errors"].append({"file": str(file_path), "error": str(e)})
 
         with self.db.transaction():
-            for i, file_path in enumerate(files_to_index):
+            # Drop the old records of every file being re-indexed in one batch
+            # rather than one cascading delete per file
+            self.db.delete_files_by_paths(list(hashes))
+
+            for i, (file_path, rel_path) in enumerate(zip(files_to_index, rel_paths)):
                 if self.progress_callback:
                     self.progress_callback(str(file_path), i + 1, total_files)
-
-                rel_path = normalize_path(file_path, base_path)
-                indexed_paths.add(rel_path)
+                if rel_path not in hashes:
+                    continue
 
                 try:
                     # Always force=True for individual files since we're doing full re-index
-                    file_stats = self._index_file(file_path, rel_path, force=True)
+                    file_stats = self._index_file(
+                        file_path, rel_path, force=True, current_hash=hashes[rel_path]
+                    )
                     if file_stats["indexed"]:
                         stats["files_indexed"] += 1
                         stats["definitions_added"] += file_stats["definitions"]
@@ -213,26 +214,15 @@ class Indexer:
         base_path: Path,
     ) -> list[Path]:
         """Discover Python files to index."""
-        all_files = []
-
-        if paths:
-            for path_str in paths:
-                path = Path(path_str)
-                if not path.is_absolute():
-                    path = base_path / path
-
-                if path.is_file() and path.suffix == ".py":
-                    all_files.append(path)
-                elif path.is_dir():
-                    all_files.extend(discover_python_files(path, include, exclude))
-        else:
-            all_files = discover_python_files(base_path, include, exclude)
-
-        return all_files
+        return discover_files(paths, include, exclude, base_path)
 
-    def _index_file(self, file_path: Path, rel_path: str, force: bool) -> dict:
+    def _index_file(
+        self, file_path: Path, rel_path: str, force: bool, current_hash: str | None = None
+    ) -> dict:
         """Index a single file.
 
+        current_hash is the file's content hash if the caller already has it.
+
         Returns:
             Dictionary with indexing statistics for this file
         """
@@ -246,7 +236,8 @@ class Indexer:
         }
 
         # Check if file needs reindexing
-        current_hash = compute_file_hash(file_path)
+        if current_hash is None:
+            current_hash = compute_file_hash(file_path)
         existing_file = self.db.get_file(rel_path)
 
         if existing_file:
@@ -343,16 +334,17 @@ class Indexer:
         result = self.db.execute("SELECT path FROM files").fetchall()
         db_paths = {r[0] for r in result}
 
-        # Find files that are in DB but no longer exist on disk
-        removed = 0
-        for db_path in db_paths:
-            if db_path not in indexed_paths:
-                full_path = base_path / db_path
-                if not full_path.exists():
-                    self.db.delete_file_by_path(db_path)
-                    removed += 1
-
-        return removed
+        # Find files that are in DB but no longer exist on disk, and delete
+        # them in one batch rather than one cascading delete per file
+        removed = [
+            db_path
+            for db_path in db_paths
+            if db_path not in indexed_paths and not os.path.exists(os.path.join(base_path, db_path))
+        ]
+        if removed:
+            self.db.delete_files_by_paths(removed)
+
+        return len(removed)
 
     def index_single_file(self, file_path: Path, base_path: Path | None = None) -> dict:
         """Index a single file.
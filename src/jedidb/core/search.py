@@ -28,6 +28,7 @@ class SearchEngine:
         type: str | None = None,
         limit: int = 20,
         include_private: bool = False,
+        fast: bool = False,
     ) -> list[SearchResult]:
         """Search definitions using hybrid search.
 
@@ -39,10 +40,15 @@ class SearchEngine:
             type: Filter by definition type (function, class, variable, etc.)
             limit: Maximum number of results
             include_private: Include private definitions (starting with _)
+            fast: Only match names by prefix (as if the query ended in *),
+                skipping full-text scoring; suited to completion
 
         Returns:
             List of SearchResult objects ordered by relevance
         """
+        if fast and not query.endswith("*"):
+            query += "*"
+
         # Wildcard search: use LIKE on search_text
         if "*" in query:
             return self._wildcard_search(query, type, limit, include_private)
@@ -155,19 +161,25 @@ class SearchEngine:
         # Tokenize query for better FTS matching (handles camelCase, snake_case)
         tokenized_query = split_identifier(query)
 
-        # Build query - FTS index is on search_text column
+        # Build query - FTS index is on search_text column. The postings and
+        # term statistics are built at index time; scoring each definition
+        # once in a subquery, rather than again in the WHERE clause, halves
+        # the BM25 work per search.
         sql = """
             SELECT
                 d.id, d.file_id, d.name, d.full_name, d.type,
                 d.line, d.col, d.end_line, d.end_col,
                 d.signature, d.docstring, d.parent_id, d.is_public,
                 f.path,
-                fts_main_definitions.match_bm25(d.id, ?) as score
-            FROM definitions d
+                d.score
+            FROM (
+                SELECT *, fts_main_definitions.match_bm25(id, ?) AS score
+                FROM definitions
+            ) d
             JOIN files f ON d.file_id = f.id
-            WHERE fts_main_definitions.match_bm25(d.id, ?) IS NOT NULL
+            WHERE d.score IS NOT NULL
         """
-        params = [tokenized_query, tokenized_query]
+        params = [tokenized_query]
 
         if type:
             sql += " AND d.type = ?"
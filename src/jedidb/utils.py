@@ -2,8 +2,10 @@
 
 import hashlib
 import logging
+import os
 import re
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 
 logger = logging.getLogger("jedidb.utils")
@@ -69,6 +71,36 @@ def normalize_path(path: Path, base_path: Path | None = None) -> str:
     return str(path)
 
 
+def normalize_paths(paths: list[Path], base_path: Path) -> list[str]:
+    """Normalize many paths relative to one base, as normalize_path does.
+
+    The base is resolved once and each path is relativized by string prefix,
+    so no intermediate Path objects are built per file.
+
+    Args:
+        paths: Paths to normalize
+        base_path: Base path to make them relative to
+
+    Returns:
+        Normalized path strings, in the same order as paths
+    """
+    base = os.path.realpath(base_path)
+    prefix = base.rstrip(os.sep) + os.sep
+    prefix_len = len(prefix)
+    realpath = os.path.realpath
+
+    rel_paths = []
+    for path in paths:
+        real = realpath(path)
+        if real.startswith(prefix):
+            rel_paths.append(real[prefix_len:])
+        elif real == base:
+            rel_paths.append(".")
+        else:
+            rel_paths.append(real)
+    return rel_paths
+
+
 def is_python_file(path: Path) -> bool:
     """Check if a path is a Python file.
 
@@ -141,22 +173,17 @@ def expand_patterns(patterns: list[str] | None) -> list[str] | None:
     return [expand_pattern(p) for p in patterns]
 
 
-def glob_match(path_str: str, pattern: str) -> bool:
-    """Match a path against a glob pattern with proper ** support.
+def glob_to_regex(pattern: str) -> str:
+    """Translate a glob pattern to an (unanchored) regular expression.
 
-    Unlike Path.match(), this correctly handles ** to match zero or more
-    directory levels.
+    ** matches zero or more directory levels, * and ? never match /.
 
     Args:
-        path_str: Path string to match
         pattern: Glob pattern (supports *, **, and ?)
 
     Returns:
-        True if the path matches the pattern
+        Regular expression source matching the same paths
     """
-    # Convert glob pattern to regex
-    # ** matches any number of directories (including zero)
-    # * matches anything except /
     regex_parts = []
     i = 0
     while i < len(pattern):
@@ -180,8 +207,40 @@ def glob_match(path_str: str, pattern: str) -> bool:
             regex_parts.append(pattern[i])
             i += 1
 
-    regex_pattern = "^" + "".join(regex_parts) + "$"
-    return bool(re.match(regex_pattern, path_str))
+    return "".join(regex_parts)
+
+
+def compile_patterns(patterns: list[str] | None) -> re.Pattern | None:
+    """Compile glob patterns into a single alternation regex.
+
+    Matching a path with one fullmatch() of the combined regex replaces a
+    glob_match() call per pattern.
+
+    Args:
+        patterns: Glob patterns (already expanded)
+
+    Returns:
+        Compiled regex, or None if there are no patterns
+    """
+    if not patterns:
+        return None
+    return re.compile("|".join(f"(?:{glob_to_regex(p)})" for p in patterns))
+
+
+def glob_match(path_str: str, pattern: str) -> bool:
+    """Match a path against a glob pattern with proper ** support.
+
+    Unlike Path.match(), this correctly handles ** to match zero or more
+    directory levels.
+
+    Args:
+        path_str: Path string to match
+        pattern: Glob pattern (supports *, **, and ?)
+
+    Returns:
+        True if the path matches the pattern
+    """
+    return re.fullmatch(glob_to_regex(pattern), path_str) is not None
 
 
 def match_glob_patterns(
@@ -212,22 +271,48 @@ def match_glob_patterns(
     # Use POSIX-style paths for consistent matching across platforms
     rel_str = rel_path.as_posix()
 
+    return _matches_compiled(rel_str, compile_patterns(include), compile_patterns(exclude))
+
+
+def _matches_compiled(
+    rel_str: str,
+    include: re.Pattern | None,
+    exclude: re.Pattern | None,
+) -> bool:
+    """Apply compiled include/exclude regexes to a POSIX relative path."""
     # Check exclude patterns first
-    if exclude:
-        for pattern in exclude:
-            if glob_match(rel_str, pattern):
-                return False
+    if exclude is not None and exclude.fullmatch(rel_str):
+        return False
 
     # Check include patterns
-    if include:
-        for pattern in include:
-            if glob_match(rel_str, pattern):
-                return True
-        return False
+    if include is not None:
+        return include.fullmatch(rel_str) is not None
 
     return True
 
 
+# Directories never indexed, wherever they appear
+DEFAULT_EXCLUDE_DIRS = [
+    "__pycache__",
+    ".git",
+    ".venv",
+    ".tox",
+    ".mypy_cache",
+    ".pytest_cache",
+    ".ruff_cache",
+    "venv",
+    "node_modules",
+    "*.egg-info",
+    "build",
+    "dist",
+]
+
+# Default exclude patterns (directories commonly excluded)
+DEFAULT_EXCLUDE = [f"**/{d}/**" for d in DEFAULT_EXCLUDE_DIRS]
+
+_DEFAULT_EXCLUDE_DIRS_RE = compile_patterns(DEFAULT_EXCLUDE_DIRS)
+
+
 def discover_python_files(
     root: Path,
     include: list[str] | None = None,
@@ -243,37 +328,157 @@ def discover_python_files(
     Returns:
         List of Python file paths
     """
+    return _walk_python_files(root, *compile_file_patterns(include, exclude))
+
+
+def compile_file_patterns(
+    include: list[str] | None,
+    exclude: list[str] | None,
+) -> tuple[re.Pattern | None, re.Pattern]:
+    """Expand and compile include/exclude patterns for file discovery.
+
+    The default excludes are added to exclude. Results are memoized, so
+    repeated discoveries with the same patterns share the compiled regexes.
+
+    Returns:
+        (include regex or None, exclude regex)
+    """
+    return _compile_file_patterns(
+        tuple(include) if include is not None else None,
+        tuple(exclude) if exclude is not None else None,
+    )
+
+
+@lru_cache(maxsize=32)
+def _compile_file_patterns(
+    include: tuple[str, ...] | None,
+    exclude: tuple[str, ...] | None,
+) -> tuple[re.Pattern | None, re.Pattern]:
+    # Expand simplified patterns to full globs
+    expanded_include = expand_patterns(list(include) if include is not None else None)
+    expanded_exclude = expand_patterns(list(exclude) if exclude is not None else None)
+
+    all_exclude = (expanded_exclude or []) + DEFAULT_EXCLUDE
+
+    # Compile each pattern list once so every file is one regex match
+    return compile_patterns(expanded_include), compile_patterns(all_exclude)
+
+
+def _walk_python_files(
+    root: Path,
+    include_re: re.Pattern | None,
+    exclude_re: re.Pattern,
+) -> list[Path]:
+    """Find .py files under root accepted by compiled include/exclude regexes."""
     root = root.resolve()
     files = []
 
-    # Expand simplified patterns to full globs
-    expanded_include = expand_patterns(include)
-    expanded_exclude = expand_patterns(exclude)
-
-    # Default exclude patterns (directories commonly excluded)
-    default_exclude = [
-        "**/__pycache__/**",
-        "**/.git/**",
-        "**/.venv/**",
-        "**/.tox/**",
-        "**/.mypy_cache/**",
-        "**/.pytest_cache/**",
-        "**/.ruff_cache/**",
-        "**/venv/**",
-        "**/node_modules/**",
-        "**/*.egg-info/**",
-        "**/build/**",
-        "**/dist/**",
-    ]
-    all_exclude = (expanded_exclude or []) + default_exclude
-
-    for path in root.rglob("*.py"):
-        if match_glob_patterns(path, expanded_include, all_exclude, root):
-            files.append(path)
+    # Walk with os.walk (os.scandir underneath) so entries are plain strings,
+    # and skip descending into default-excluded directories entirely; their
+    # files would all be rejected by exclude_re anyway.
+    root_str = str(root)
+    prefix_len = len(root_str.rstrip(os.sep)) + 1
+    is_excluded = exclude_re.fullmatch
+    is_included = include_re.fullmatch if include_re is not None else None
+    prune = _DEFAULT_EXCLUDE_DIRS_RE.fullmatch
+    for dirpath, dirnames, filenames in os.walk(root_str):
+        dirnames[:] = [d for d in dirnames if not prune(d)]
+
+        # Relativize once per directory, not once per file
+        rel_dir = dirpath[prefix_len:]
+        if os.sep != "/":
+            rel_dir = rel_dir.replace(os.sep, "/")
+        if rel_dir:
+            rel_dir += "/"
+
+        for name in filenames:
+            if not name.endswith(".py"):
+                continue
+            rel_str = rel_dir + name
+            if is_excluded(rel_str) or (is_included is not None and not is_included(rel_str)):
+                continue
+            files.append(Path(dirpath, name))
 
     return sorted(files)
 
 
+def discover_files(
+    paths: list[str] | None,
+    include: list[str] | None,
+    exclude: list[str] | None,
+    base_path: Path,
+) -> list[Path]:
+    """Discover Python files to index from explicit paths or the base path.
+
+    Args:
+        paths: Files or directories to index; relative paths are resolved
+            against base_path. If empty, base_path is searched.
+        include: Glob patterns to include (simplified patterns are expanded)
+        exclude: Glob patterns to exclude (simplified patterns are expanded)
+        base_path: Project root
+
+    Returns:
+        List of Python file paths
+    """
+    # Compile the patterns once for every directory walked
+    patterns = compile_file_patterns(include, exclude)
+
+    if not paths:
+        return _walk_python_files(base_path, *patterns)
+
+    all_files = []
+    for path_str in paths:
+        path = Path(path_str)
+        if not path.is_absolute():
+            path = base_path / path
+
+        if path.is_file() and path.suffix == ".py":
+            all_files.append(path)
+        elif path.is_dir():
+            all_files.extend(_walk_python_files(path, *patterns))
+
+    return all_files
+
+
+def diff_file_hashes(
+    indexed: dict[str, str],
+    disk_files: list[Path],
+    rel_paths: list[str],
+) -> dict:
+    """Compare files on disk against the hashes recorded in an index.
+
+    Args:
+        indexed: Mapping of indexed relative path to content hash
+        disk_files: Files currently on disk
+        rel_paths: Relative path of each file in disk_files
+
+    Returns:
+        Dictionary with is_stale and the changed, added and removed paths
+    """
+    disk_paths = dict(zip(rel_paths, disk_files))
+
+    changed = []
+    added = []
+
+    # Check for changed and new files
+    for rel_path, abs_path in disk_paths.items():
+        if rel_path in indexed:
+            if compute_file_hash(abs_path) != indexed[rel_path]:
+                changed.append(rel_path)
+        else:
+            added.append(rel_path)
+
+    # Check for removed files
+    removed = [db_path for db_path in indexed if db_path not in disk_paths]
+
+    return {
+        "is_stale": bool(changed or added or removed),
+        "changed": changed,
+        "added": added,
+        "removed": removed,
+    }
+
+
 def get_context_lines(file_path: Path, line: int, context: int = 1) -> str:
     """Get lines of context around a specific line.
 
@@ -1,12 +1,12 @@
 """Tests for CLI module."""
 
+import json
+
 import pytest
-from pathlib import Path
 from typer.testing import CliRunner
 
 from jedidb.cli.app import app
 
-
 runner = CliRunner()
 
 
@@ -19,6 +19,34 @@ class TestCLI:
         assert result.exit_code == 0
         assert "jedidb" in result.output.lower()
 
+    def test_help_lists_all_commands(self):
+        """Test lazily registered commands all appear in help."""
+        from jedidb.cli.app import COMMANDS
+
+        result = runner.invoke(app, ["--help"])
+        assert result.exit_code == 0
+        for name in COMMANDS:
+            assert name in result.output
+
+    def test_commands_resolve(self):
+        """Test every registered name maps to exactly one command module."""
+        import importlib
+        import pkgutil
+
+        import jedidb.cli.commands
+        from jedidb.cli.app import COMMANDS
+
+        modules = {m.name for m in pkgutil.iter_modules(jedidb.cli.commands.__path__)}
+        assert modules == set(COMMANDS)
+        for name in COMMANDS:
+            module = importlib.import_module(f"jedidb.cli.commands.{name}")
+            assert callable(getattr(module, f"{name}_cmd"))
+
+    def test_unknown_command(self):
+        """Test an unknown command is rejected."""
+        result = runner.invoke(app, ["nosuch"])
+        assert result.exit_code != 0
+
     def test_init_command(self, temp_dir):
         """Test init command."""
         result = runner.invoke(app, ["-C", str(temp_dir), "init"])
@@ -29,6 +57,18 @@ class TestCLI:
         assert (temp_dir / ".jedidb" / "config.toml").exists()
         assert (temp_dir / ".jedidb" / "db").exists()
 
+    def test_init_gitignore(self, temp_dir):
+        """Test init appends the index to an existing .gitignore once."""
+        runner.invoke(app, ["-C", str(temp_dir), "init"])
+        assert not (temp_dir / ".gitignore").exists()
+
+        gitignore = temp_dir / ".gitignore"
+        gitignore.write_text("*.pyc\n")
+        result = runner.invoke(app, ["-C", str(temp_dir), "init", "--force"])
+        assert "Added .jedidb/ to .gitignore" in result.output
+        runner.invoke(app, ["-C", str(temp_dir), "init", "--force"])
+        assert gitignore.read_text() == "*.pyc\n\n# JediDB\n.jedidb/\n"
+
     def test_init_already_exists(self, temp_dir):
         """Test init when already initialized."""
         # Initialize once
@@ -56,6 +96,10 @@ class TestCLI:
         assert result.exit_code == 0
         assert "indexed" in result.output.lower()
 
+        # The snapshot's size is reported beside the parquet files'
+        snapshot = sample_project / ".jedidb" / "db" / "jedidb.duckdb"
+        assert f"Snapshot:    {snapshot.stat().st_size:,} bytes" in result.output
+
     def test_index_with_patterns(self, sample_project):
         """Test index with include/exclude patterns."""
         runner.invoke(app, ["-C", str(sample_project), "init"])
@@ -68,6 +112,45 @@ class TestCLI:
         ])
         assert result.exit_code == 0
 
+    def test_index_progress_lines(self, sample_project):
+        """Test plain-text progress reports every file, in order."""
+        runner.invoke(app, ["-C", str(sample_project), "init"])
+
+        result = runner.invoke(app, ["-C", str(sample_project), "index"])
+        assert result.exit_code == 0
+        progress = [line for line in result.output.splitlines() if line.startswith("Indexing [")]
+        total = len(progress)
+        assert total >= 2
+        assert [line.split("]")[0] for line in progress] == [
+            f"Indexing [{i}/{total}" for i in range(1, total + 1)
+        ]
+
+    def test_index_force_resets_broken_index(self, sample_project):
+        """Test an unreadable index fails with a hint, and --force rebuilds it."""
+        runner.invoke(app, ["-C", str(sample_project), "init"])
+        runner.invoke(app, ["-C", str(sample_project), "index", "--quiet"])
+        db_dir = sample_project / ".jedidb" / "db"
+        (db_dir / "jedidb.duckdb").unlink()
+        (db_dir / "definitions.parquet").write_bytes(b"not parquet")
+
+        result = runner.invoke(app, ["-C", str(sample_project), "index", "--quiet"])
+        assert result.exit_code == 1
+        assert "--force" in result.output
+
+        result = runner.invoke(app, ["-C", str(sample_project), "index", "--quiet", "--force"])
+        assert result.exit_code == 0
+        assert "resetting" in result.output
+        assert (db_dir / "jedidb.duckdb").exists()
+
+    def test_index_nothing_to_index(self, temp_dir):
+        """Test indexing a project with no matching files creates no database."""
+        runner.invoke(app, ["-C", str(temp_dir), "init"])
+
+        result = runner.invoke(app, ["-C", str(temp_dir), "index", "--quiet"])
+        assert result.exit_code == 0
+        assert "No Python files to index" in result.output
+        assert not (temp_dir / ".jedidb" / "db" / "definitions.parquet").exists()
+
     def test_search_command(self, sample_project):
         """Test search command."""
         runner.invoke(app, ["-C", str(sample_project), "init"])
@@ -89,6 +172,81 @@ class TestCLI:
         ])
         assert result.exit_code == 0
 
+    def test_search_fast(self, sample_project):
+        """Test --fast matches names by prefix like a trailing wildcard."""
+        runner.invoke(app, ["-C", str(sample_project), "init"])
+        runner.invoke(app, ["-C", str(sample_project), "index"])
+
+        search = ["-C", str(sample_project), "search", "-f", "jsonl"]
+        fast = runner.invoke(app, [*search, "helper", "--fast"])
+        prefix = runner.invoke(app, [*search, "helper*"])
+        assert fast.exit_code == 0
+        assert "helper_function" in fast.output
+        assert fast.output == prefix.output
+
+    def test_search_cache(self, sample_project):
+        """Test --cache serves repeated searches from the cache until re-index."""
+        cache_dir = sample_project / ".jedidb" / "cache" / "search"
+
+        runner.invoke(app, ["-C", str(sample_project), "init"])
+        runner.invoke(app, ["-C", str(sample_project), "index"])
+
+        # Without --cache nothing is written
+        runner.invoke(app, ["-C", str(sample_project), "search", "helper*", "-f", "jsonl"])
+        assert not cache_dir.exists()
+
+        args = ["-C", str(sample_project), "search", "extra*", "-f", "jsonl", "--cache"]
+        first = runner.invoke(app, args)
+        assert first.exit_code == 0
+        assert "No results" in first.output
+
+        args[3] = "helper*"
+        first = runner.invoke(app, args)
+        assert len(list(cache_dir.iterdir())) == 1
+        second = runner.invoke(app, args)
+        assert second.exit_code == 0
+        assert second.output == first.output
+
+        (sample_project / "src" / "extra.py").write_text("def helper_extra():\n    pass\n")
+        runner.invoke(app, ["-C", str(sample_project), "index"])
+        third = runner.invoke(app, args)
+        assert "helper_extra" in third.output
+        assert len(list(cache_dir.iterdir())) == 1
+
+        # CSV line endings survive the round trip
+        args[5] = "csv"
+        first = runner.invoke(app, args)
+        second = runner.invoke(app, args)
+        assert b"\r\n" in first.stdout_bytes
+        assert second.stdout_bytes == first.stdout_bytes
+
+    def test_search_cache_best_effort(self, sample_project, monkeypatch):
+        """Test searches work without a writable cache and the cache is capped."""
+        from jedidb.cli.commands import search
+
+        runner.invoke(app, ["-C", str(sample_project), "init"])
+        runner.invoke(app, ["-C", str(sample_project), "index"])
+
+        cache_dir = sample_project / ".jedidb" / "cache" / "search"
+        cache_dir.parent.mkdir(parents=True, exist_ok=True)
+        cache_dir.write_text("not a directory")
+        result = runner.invoke(app, [
+            "-C", str(sample_project), "search", "helper*", "-f", "jsonl", "--cache",
+        ])
+        assert result.exit_code == 0
+        assert result.output.startswith('{"name":"helper_function"')
+
+        cache_dir.unlink()
+        monkeypatch.setattr(search, "SEARCH_CACHE_SIZE", 2)
+        outputs = {}
+        for query in ("helper*", "main*", "Config*"):
+            args = ["-C", str(sample_project), "search", query, "-f", "jsonl", "--cache"]
+            outputs[query] = runner.invoke(app, args).output
+        assert len(list(cache_dir.iterdir())) <= 2
+        for query, output in outputs.items():
+            args = ["-C", str(sample_project), "search", query, "-f", "jsonl", "--cache"]
+            assert runner.invoke(app, args).output == output
+
     def test_search_json_output(self, sample_project):
         """Test search with JSON output."""
         runner.invoke(app, ["-C", str(sample_project), "init"])
@@ -158,6 +316,164 @@ class TestCLI:
         ])
         assert result.exit_code == 0
 
+    def test_query_csv_stdout(self, sample_project):
+        """Test CSV query output on stdout, including empty results."""
+        runner.invoke(app, ["-C", str(sample_project), "init"])
+        runner.invoke(app, ["-C", str(sample_project), "index"])
+
+        result = runner.invoke(app, [
+            "-C", str(sample_project),
+            "query",
+            "SELECT DISTINCT name, type FROM definitions "
+            "WHERE name = 'helper_function' AND type = 'function'",
+            "--format", "csv",
+        ])
+        assert result.exit_code == 0
+        assert result.output.splitlines() == ["name,type", "helper_function,function"]
+
+        result = runner.invoke(app, [
+            "-C", str(sample_project),
+            "query",
+            "SELECT name FROM definitions WHERE false",
+            "--format", "csv",
+        ])
+        assert result.exit_code == 0
+        assert result.output.strip() == "No results"
+
+    def test_query_csv_stdout_bytes(self, sample_project):
+        """Test CSV on stdout is byte-identical to format_rows_csv."""
+        import duckdb
+
+        from jedidb.cli.formatters import format_rows_csv
+
+        runner.invoke(app, ["-C", str(sample_project), "init"])
+        runner.invoke(app, ["-C", str(sample_project), "index"])
+        sql = "SELECT 0.1::DOUBLE + 0.2 AS f, true AS b, '' AS s, NULL AS n"
+
+        result = runner.invoke(app, ["-C", str(sample_project), "query", sql, "-f", "csv"])
+        assert result.exit_code == 0
+        relation = duckdb.sql(sql)
+        expected = format_rows_csv(relation.columns, relation.fetchall()) + "\n"
+        # stdout_bytes, since output normalizes line endings
+        assert result.stdout_bytes.decode() == expected
+        assert result.stdout_bytes == b"f,b,s,n\r\n0.30000000000000004,True,,\r\n"
+
+    def test_query_jsonl_matches_json(self, sample_project):
+        """Test JSONL output encodes values the same way as JSON output."""
+        runner.invoke(app, ["-C", str(sample_project), "init"])
+        runner.invoke(app, ["-C", str(sample_project), "index"])
+        sql = "SELECT 1.50::DECIMAL(4, 2) AS d, 1e16::DOUBLE AS f, 'ü' AS s"
+
+        documents = {}
+        for fmt in ("json", "jsonl"):
+            result = runner.invoke(app, ["-C", str(sample_project), "query", sql, "-f", fmt])
+            assert result.exit_code == 0
+            documents[fmt] = result.output
+        rows = [json.loads(line) for line in documents["jsonl"].splitlines()]
+        assert rows == json.loads(documents["json"])
+        assert rows == [{"d": "1.50", "f": 1e16, "s": "ü"}]
+
+    def test_query_limit(self, sample_project):
+        """Test --limit applies even when the query has its own LIMIT."""
+        runner.invoke(app, ["-C", str(sample_project), "init"])
+        runner.invoke(app, ["-C", str(sample_project), "index"])
+
+        for fmt in ("jsonl", "csv"):
+            result = runner.invoke(app, [
+                "-C", str(sample_project),
+                "query",
+                "SELECT name FROM definitions LIMIT 5 -- five",
+                "--limit", "2",
+                "--format", fmt,
+            ])
+            assert result.exit_code == 0
+            assert len(result.output.splitlines()) == (2 if fmt == "jsonl" else 3)
+
+    def test_query_table(self, sample_project):
+        """Test table output pads every column to its widest cell."""
+        runner.invoke(app, ["-C", str(sample_project), "init"])
+        runner.invoke(app, ["-C", str(sample_project), "index"])
+
+        result = runner.invoke(app, [
+            "-C", str(sample_project),
+            "query",
+            "SELECT * FROM (VALUES ('a', NULL), ('long name', 12)) t(name, n)",
+            "--format", "table",
+        ])
+        assert result.exit_code == 0
+        assert result.output.splitlines()[:4] == [
+            "name       n ",
+            "-------------",
+            "a            ",
+            "long name  12",
+        ]
+        assert "2 row(s)" in result.output
+
+    def test_query_output_file(self, sample_project):
+        """Test query results written to files by extension."""
+        runner.invoke(app, ["-C", str(sample_project), "init"])
+        runner.invoke(app, ["-C", str(sample_project), "index"])
+        sql = (
+            "SELECT DISTINCT name, type FROM definitions "
+            "WHERE name = 'helper_function' AND type = 'function'"
+        )
+
+        out = sample_project / "out.json"
+        result = runner.invoke(app, ["-C", str(sample_project), "query", sql, "-o", str(out)])
+        assert result.exit_code == 0
+        assert "Wrote 1 row(s)" in result.output
+        assert json.loads(out.read_text()) == [{"name": "helper_function", "type": "function"}]
+
+        out = sample_project / "out.jsonl"
+        runner.invoke(app, ["-C", str(sample_project), "query", sql, "-o", str(out)])
+        assert [json.loads(line) for line in out.read_text().splitlines()] == [
+            {"name": "helper_function", "type": "function"}
+        ]
+
+        out = sample_project / "empty.csv"
+        result = runner.invoke(app, [
+            "-C", str(sample_project),
+            "query", "SELECT name FROM definitions WHERE false",
+            "-o", str(out),
+        ])
+        assert "No results" in result.output
+        assert not out.exists()
+
+    def test_query_output_file_matches_stdout(self, sample_project):
+        """Test a file written with -o holds the same document as stdout."""
+        runner.invoke(app, ["-C", str(sample_project), "init"])
+        runner.invoke(app, ["-C", str(sample_project), "index"])
+        sql = "SELECT 1.50::DECIMAL(4, 2) AS d, true AS b, 'ü' AS s"
+
+        for fmt in ("json", "jsonl", "csv"):
+            out = sample_project / f"out.{fmt}"
+            result = runner.invoke(app, ["-C", str(sample_project), "query", sql, "-o", str(out)])
+            assert result.exit_code == 0
+            stdout = runner.invoke(app, ["-C", str(sample_project), "query", sql, "-f", fmt])
+            assert out.read_bytes() == stdout.stdout_bytes
+
+    def test_query_error_while_streaming(self, sample_project, monkeypatch):
+        """Test an error fetching a later batch is reported, not raised."""
+        from jedidb.cli.formatters import PrefetchedResult
+
+        runner.invoke(app, ["-C", str(sample_project), "init"])
+        runner.invoke(app, ["-C", str(sample_project), "index"])
+
+        fetchmany = PrefetchedResult.fetchmany
+
+        def failing_fetchmany(self, size):
+            if self._first is None:
+                raise RuntimeError("batch failed")
+            return fetchmany(self, size)
+
+        monkeypatch.setattr(PrefetchedResult, "fetchmany", failing_fetchmany)
+        result = runner.invoke(app, [
+            "-C", str(sample_project), "query", "SELECT name FROM definitions", "-f", "jsonl",
+        ])
+        assert result.exit_code == 1
+        assert "Query error: batch failed" in result.output
+        assert result.exception is None or isinstance(result.exception, SystemExit)
+
     def test_show_command(self, sample_project):
         """Test show command."""
         runner.invoke(app, ["-C", str(sample_project), "init"])
@@ -169,6 +485,284 @@ class TestCLI:
         ])
         assert result.exit_code == 0
 
+    def test_source_jsonl(self, sample_project):
+        """Test source JSONL output has one compact object per line."""
+        runner.invoke(app, ["-C", str(sample_project), "init"])
+        runner.invoke(app, ["-C", str(sample_project), "index"])
+
+        result = runner.invoke(
+            app, ["-C", str(sample_project), "source", "helper_function", "-f", "jsonl"]
+        )
+        assert result.exit_code == 0
+        data = json.loads(result.output)
+        assert data["file"] == "src/utils.py"
+        assert "def helper_function" in data["source"]
+
+        result = runner.invoke(
+            app, ["-C", str(sample_project), "source", "main", "--calls", "-f", "jsonl"]
+        )
+        assert result.exit_code == 0
+        lines = result.output.strip().splitlines()
+        assert any(json.loads(line)["callee_name"] == "helper_function" for line in lines)
+
+    def test_source_all(self, sample_project):
+        """Test --all lists matches as a table or as JSON rows."""
+        runner.invoke(app, ["-C", str(sample_project), "init"])
+        runner.invoke(app, ["-C", str(sample_project), "index"])
+
+        args = ["-C", str(sample_project), "source", "helper_function", "--all"]
+        result = runner.invoke(app, args + ["-f", "table"])
+        assert result.exit_code == 0
+        assert "src/utils.py" in result.output
+        assert "definition(s). Use --id" in result.output
+
+        result = runner.invoke(app, args + ["-f", "json"])
+        rows = json.loads(result.output)
+        assert {"id", "file", "size"} <= rows[0].keys()
+        assert rows[0]["file"] == "src/utils.py"
+
+    def test_source_argument_errors(self, temp_dir):
+        """Test source rejects missing arguments before opening an index."""
+        result = runner.invoke(app, ["-C", str(temp_dir), "source"])
+        assert result.exit_code == 1
+        assert "NAME argument or --id" in result.output
+
+        result = runner.invoke(app, ["-C", str(temp_dir), "source", "--id", "1", "--all"])
+        assert result.exit_code == 1
+        assert "--all requires a NAME" in result.output
+
+    def test_source_lines_file_cache(self, temp_dir):
+        """Test a shared file cache reads each file once per listing."""
+        from jedidb.cli.commands.source import _read_source_lines
+
+        path = temp_dir / "mod.py"
+        path.write_text("a = 1\nb = 2\nc = 3\n")
+        cache = {}
+        assert _read_source_lines(path, 2, None, 0, cache) == (["b = 2\n"], 2, 2)
+
+        path.write_text("changed\n")
+        assert _read_source_lines(path, 3, None, 1, cache) == (["b = 2\n", "c = 3\n"], 2, 3)
+        assert _read_source_lines(temp_dir / "missing.py", 4, None, 1, cache) == ([], 4, 4)
+        assert cache[temp_dir / "missing.py"] is None
+
+    def test_source_lines_window(self, temp_dir):
+        """Test uncached reads return the same window, clamped at EOF."""
+        from jedidb.cli.commands.source import _read_source_lines
+
+        path = temp_dir / "mod.py"
+        path.write_text("".join(f"line{i}\n" for i in range(1, 11)))
+        for start, end, context in [(5, None, 2), (1, 3, 2), (9, None, 3), (4, 10, 0)]:
+            cached = _read_source_lines(path, start, end, context, {})
+            assert _read_source_lines(path, start, end, context) == cached
+        lines = ["line6\n", "line7\n", "line8\n", "line9\n", "line10\n"]
+        assert _read_source_lines(path, 9, None, 3) == (lines, 6, 10)
+
+    def test_serve(self, sample_project):
+        """Test serve answers one JSON line per request from one open index."""
+        runner.invoke(app, ["-C", str(sample_project), "init"])
+        runner.invoke(app, ["-C", str(sample_project), "index"])
+
+        requests = "\n".join([
+            json.dumps({"command": "search", "query": "helper", "fast": True}),
+            json.dumps({"command": "show", "name": "helper_function", "refs": True}),
+            json.dumps({"command": "show", "name": "missing"}),
+            json.dumps({"command": "search"}),
+            json.dumps({"command": "nosuch"}),
+        ])
+        result = runner.invoke(app, ["-C", str(sample_project), "serve", "--stdio"], input=requests)
+        assert result.exit_code == 0
+        search, show, missing, no_query, unknown = map(json.loads, result.output.splitlines())
+        assert search["results"][0]["name"] == "helper_function"
+        assert show["definition"]["file"] == "src/utils.py"
+        assert isinstance(show["references"], list)
+        assert "not found" in missing["error"]
+        assert "query" in no_query["error"]
+        assert "Unknown command" in unknown["error"]
+
+    def test_serve_reopen_failure(self, sample_project, monkeypatch):
+        """Test a failed reopen after a re-index keeps serving from the open index."""
+        from jedidb.api import JediDB
+        from jedidb.cli.commands import serve
+
+        runner.invoke(app, ["-C", str(sample_project), "init"])
+        runner.invoke(app, ["-C", str(sample_project), "index"])
+
+        # The first request sees a re-index whose reopen fails; the second
+        # sees the original generation again and must use the old instance
+        generations = iter([0, 1, 0])
+        monkeypatch.setattr(serve, "_generation", lambda jedidb: next(generations))
+        open_readonly = JediDB.open_readonly
+        opens = []
+
+        def flaky_open(*args, **kwargs):
+            opens.append(1)
+            if len(opens) == 2:
+                raise OSError("index is being rewritten")
+            return open_readonly(*args, **kwargs)
+
+        monkeypatch.setattr(JediDB, "open_readonly", flaky_open)
+        close = JediDB.close
+        closed = []
+
+        def counting_close(self):
+            closed.append(self)
+            close(self)
+
+        monkeypatch.setattr(JediDB, "close", counting_close)
+
+        request = json.dumps({"command": "search", "query": "helper", "fast": True})
+        result = runner.invoke(
+            app, ["-C", str(sample_project), "serve", "--stdio"], input=f"{request}\n{request}\n"
+        )
+        assert result.exit_code == 0
+        failed, retried = map(json.loads, result.output.splitlines())
+        assert "being rewritten" in failed["error"]
+        assert retried["results"][0]["name"] == "helper_function"
+        assert len(closed) == 1
+
+    def test_serve_socket_fast_path(self, sample_project, monkeypatch):
+        """Test search and show are answered by a running server when there is one."""
+        import socket
+        import threading
+
+        from jedidb.api import JediDB
+        from jedidb.cli.commands import serve
+
+        runner.invoke(app, ["-C", str(sample_project), "init"])
+        runner.invoke(app, ["-C", str(sample_project), "index"])
+        index = sample_project / ".jedidb"
+        monkeypatch.setenv("XDG_RUNTIME_DIR", str(sample_project))
+
+        search_args = ["-C", str(sample_project), "search", "helper", "-f", "jsonl"]
+        show_args = ["-C", str(sample_project), "show", "helper_function", "--refs"]
+        inline = [runner.invoke(app, args).output for args in (search_args, show_args)]
+
+        server = serve.IndexServer(sample_project, index)
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(str(serve.socket_path(index)))
+        listener.listen()
+        thread = threading.Thread(target=serve._serve_socket, args=(server, listener))
+        thread.start()
+        try:
+            # Opening the index in the client now fails, so output can only
+            # come from the server
+            def no_open(*args, **kwargs):
+                raise OSError("opened inline")
+
+            monkeypatch.setattr(JediDB, "open_readonly", no_open)
+            served = [runner.invoke(app, args) for args in (search_args, show_args)]
+            missing = runner.invoke(app, ["-C", str(sample_project), "show", "nosuch"])
+        finally:
+            listener.shutdown(socket.SHUT_RDWR)
+            thread.join(timeout=10)
+            listener.close()
+            server.close()
+
+        assert [result.output for result in served] == inline
+        assert all(result.exit_code == 0 for result in served)
+        # Errors from the server fall back to the inline path and its message
+        assert "opened inline" in missing.output
+
+    def test_calls_command(self, sample_project):
+        """Test calls command with nested depth."""
+        runner.invoke(app, ["-C", str(sample_project), "init"])
+        runner.invoke(app, ["-C", str(sample_project), "index"])
+
+        result = runner.invoke(app, [
+            "-C", str(sample_project),
+            "calls", "main",
+            "--depth", "2",
+            "--format", "json",
+        ])
+        assert result.exit_code == 0
+        assert "helper_function" in result.output
+        assert "nested_calls" in result.output
+
+    def test_calls_jsonl_output_file(self, sample_project):
+        """Test flat JSONL calls output written straight to a file."""
+        import json
+
+        output_file = sample_project / "calls.jsonl"
+        runner.invoke(app, ["-C", str(sample_project), "init"])
+        runner.invoke(app, ["-C", str(sample_project), "index"])
+
+        result = runner.invoke(app, [
+            "-C", str(sample_project),
+            "calls", "main",
+            "--output", str(output_file),
+        ])
+        assert result.exit_code == 0
+        rows = [json.loads(line) for line in output_file.read_text().splitlines()]
+        assert any(r["callee_name"] == "helper_function" for r in rows)
+        assert list(rows[0]) == [
+            "callee_full_name", "callee_name", "line", "col", "context", "call_order", "call_depth",
+        ]
+
+    def test_calls_json_output_file(self, sample_project):
+        """Test flat JSON calls output is a single array written to a file."""
+        import json
+
+        output_file = sample_project / "calls.json"
+        runner.invoke(app, ["-C", str(sample_project), "init"])
+        runner.invoke(app, ["-C", str(sample_project), "index"])
+
+        result = runner.invoke(app, [
+            "-C", str(sample_project),
+            "calls", "main",
+            "--output", str(output_file),
+        ])
+        assert result.exit_code == 0
+        rows = json.loads(output_file.read_text())
+        assert any(r["callee_name"] == "helper_function" for r in rows)
+        assert f"Wrote {len(rows)} row(s)" in result.output
+
+    def test_calls_output_file_kept_without_calls(self, sample_project):
+        """Test an empty result leaves an existing output file alone."""
+        output_file = sample_project / "calls.jsonl"
+        output_file.write_text("keep me\n")
+        runner.invoke(app, ["-C", str(sample_project), "init"])
+        runner.invoke(app, ["-C", str(sample_project), "index"])
+
+        result = runner.invoke(app, [
+            "-C", str(sample_project),
+            "calls", "helper_function",
+            "--output", str(output_file),
+        ])
+        assert result.exit_code == 0
+        assert "No calls found" in result.output
+        assert output_file.read_text() == "keep me\n"
+        assert [p.name for p in sample_project.glob(".calls.jsonl*")] == []
+
+    def test_calls_tree(self, sample_project):
+        """Test calls command tree output."""
+        runner.invoke(app, ["-C", str(sample_project), "init"])
+        runner.invoke(app, ["-C", str(sample_project), "index"])
+
+        result = runner.invoke(app, [
+            "-C", str(sample_project),
+            "calls", "main",
+            "--depth", "2",
+            "--tree",
+        ])
+        assert result.exit_code == 0
+        assert "helper_function (line" in result.output
+        assert "`-- " in result.output
+
+    def test_format_calls_tree(self):
+        """Test format_calls_tree keeps its (calls, depth, prefix) signature."""
+        from jedidb.cli.commands.calls import format_calls_tree
+
+        calls = [
+            {"callee_name": "a", "line": 1, "nested_calls": [{"callee_name": "b", "line": 2}]},
+            {"callee_name": "c", "line": 3},
+        ]
+        assert format_calls_tree(calls, 0, "> ").splitlines() == [
+            "> |-- a (line 1)",
+            "> |   `-- b (line 2)",
+            "> `-- c (line 3)",
+        ]
+        assert format_calls_tree(calls, depth=1) == format_calls_tree(calls)
+
     def test_export_command(self, sample_project):
         """Test export command."""
         output_file = sample_project / "export.json"
@@ -185,6 +779,90 @@ class TestCLI:
         assert result.exit_code == 0
         assert output_file.exists()
 
+    def test_export_output_file_matches_stdout(self, sample_project):
+        """Test a file written with --output holds the same document as stdout."""
+        runner.invoke(app, ["-C", str(sample_project), "init"])
+        runner.invoke(app, ["-C", str(sample_project), "index"])
+
+        for fmt in ("json", "csv"):
+            output_file = sample_project / f"export.{fmt}"
+            args = ["-C", str(sample_project), "export", "--format", fmt]
+            result = runner.invoke(app, args + ["--output", str(output_file)])
+            assert result.exit_code == 0
+            stdout = runner.invoke(app, args)
+            assert output_file.read_bytes() == stdout.stdout_bytes
+
+    def test_export_cache(self, sample_project):
+        """Test repeated file exports are served from the cache until re-index."""
+        output_file = sample_project / "defs.csv"
+        cache_dir = sample_project / ".jedidb" / "cache" / "exports"
+
+        runner.invoke(app, ["-C", str(sample_project), "init"])
+        runner.invoke(app, ["-C", str(sample_project), "index"])
+
+        args = ["-C", str(sample_project), "export", "--output", str(output_file)]
+        first = runner.invoke(app, args)
+        assert first.exit_code == 0
+        assert len(list(cache_dir.iterdir())) == 1
+        content = output_file.read_text()
+
+        output_file.unlink()
+        second = runner.invoke(app, args)
+        assert second.exit_code == 0
+        assert second.output == first.output
+        assert output_file.read_text() == content
+
+        (sample_project / "src" / "extra.py").write_text("def extra():\n    pass\n")
+        runner.invoke(app, ["-C", str(sample_project), "index"])
+        runner.invoke(app, args)
+        assert "extra" in output_file.read_text()
+        assert len(list(cache_dir.iterdir())) == 1
+
+        # A cache hit that cannot be written is reported, not raised
+        missing = sample_project / "missing" / "defs.csv"
+        result = runner.invoke(app, ["-C", str(sample_project), "export", "--output", str(missing)])
+        assert result.exit_code == 1
+        assert "Failed to write" in result.output
+
+    def test_export_without_writable_cache(self, sample_project):
+        """Test a cache that cannot be written does not fail the export."""
+        output_file = sample_project / "defs.csv"
+        cache_dir = sample_project / ".jedidb" / "cache" / "exports"
+
+        runner.invoke(app, ["-C", str(sample_project), "init"])
+        runner.invoke(app, ["-C", str(sample_project), "index"])
+        cache_dir.parent.mkdir(parents=True, exist_ok=True)
+        cache_dir.write_text("not a directory")
+
+        result = runner.invoke(
+            app, ["-C", str(sample_project), "export", "--output", str(output_file)]
+        )
+        assert result.exit_code == 0
+        assert "Wrote" in result.output
+        assert "helper_function" in output_file.read_text()
+
+    def test_export_type_filter_is_bound(self, sample_project):
+        """Test --type is passed as a query parameter, not spliced into SQL."""
+        import json
+
+        runner.invoke(app, ["-C", str(sample_project), "init"])
+        runner.invoke(app, ["-C", str(sample_project), "index"])
+
+        for output_file in (None, sample_project / "classes.json"):
+            args = ["-C", str(sample_project), "export", "--format", "json"]
+            if output_file:
+                args += ["--output", str(output_file)]
+
+            result = runner.invoke(app, args + ["--type", "class"])
+            assert result.exit_code == 0
+            text = output_file.read_text() if output_file else result.output
+            assert {row["type"] for row in json.loads(text)} == {"class"}
+
+            result = runner.invoke(app, args + ["--type", "x' OR '1'='1"])
+            assert result.exit_code == 0
+            text = output_file.read_text() if output_file else result.output
+            assert json.loads(text) == []
+
     def test_clean_command(self, sample_project):
         """Test clean command."""
         runner.invoke(app, ["-C", str(sample_project), "init"])
@@ -193,6 +871,19 @@ class TestCLI:
         result = runner.invoke(app, ["-C", str(sample_project), "clean"])
         assert result.exit_code == 0
 
+    def test_clean_removes_stale_files(self, sample_project):
+        """Test clean removes entries for deleted files and persists the change."""
+        runner.invoke(app, ["-C", str(sample_project), "init"])
+        runner.invoke(app, ["-C", str(sample_project), "index"])
+        (sample_project / "src" / "utils.py").unlink()
+
+        result = runner.invoke(app, ["-C", str(sample_project), "clean"])
+        assert result.exit_code == 0
+        assert "Removed 1 stale file entries" in result.output
+
+        result = runner.invoke(app, ["-C", str(sample_project), "clean"])
+        assert "No stale entries found" in result.output
+
     def test_clean_all_command(self, sample_project):
         """Test clean --all command."""
         runner.invoke(app, ["-C", str(sample_project), "init"])
@@ -241,3 +932,83 @@ class TestCLI:
             "stats",
         ])
         assert result.exit_code == 0
+
+
+@pytest.fixture
+def class_project(temp_dir):
+    """Create and index a project with a small class hierarchy."""
+    (temp_dir / "shapes.py").write_text(
+        "class Base:\n    pass\n\n"
+        "class Mixin:\n    pass\n\n"
+        "class Shape(Base, Mixin):\n    pass\n\n"
+        "class Circle(Shape):\n    pass\n\n"
+        "class Square(Shape):\n    pass\n\n"
+        "class Unit(Square, Circle):\n    pass\n"
+    )
+    runner.invoke(app, ["-C", str(temp_dir), "init"])
+    runner.invoke(app, ["-C", str(temp_dir), "index", "--quiet"])
+    return temp_dir
+
+
+class TestInheritance:
+    """Tests for the inheritance command."""
+
+    def test_tree(self, class_project):
+        """Test the full tree walks ancestors, then descendants, once each."""
+        result = runner.invoke(app, [
+            "-C", str(class_project), "inheritance", "Shape", "--tree", "-f", "table",
+        ])
+        assert result.exit_code == 0
+        assert result.output.splitlines()[2:] == [
+            "shapes.Shape",
+            "|-- shapes.Base",
+            "|-- shapes.Mixin",
+            "|-- shapes.Circle",
+            "|   `-- shapes.Unit",
+            "`-- shapes.Square",
+        ]
+
+    def test_tree_ancestors(self, class_project):
+        """Test a leaf class's tree follows every base up to the roots."""
+        result = runner.invoke(app, [
+            "-C", str(class_project), "inheritance", "Unit", "--tree", "-f", "table",
+        ])
+        assert result.exit_code == 0
+        assert result.output.splitlines()[2:] == [
+            "shapes.Unit",
+            "|-- shapes.Square",
+            "|   `-- shapes.Shape",
+            "|       |-- shapes.Base",
+            "|       `-- shapes.Mixin",
+            "|-- shapes.Circle",
+        ]
+
+    def test_format_tree_branch(self, class_project):
+        """Test format_tree still draws a branch from prefix, is_last, visited and depth."""
+        from jedidb import JediDB
+        from jedidb.cli.commands.inheritance import format_tree
+
+        jedidb = JediDB.open_readonly(source=class_project, index=class_project / ".jedidb")
+        try:
+            visited = {"shapes.Base"}
+            lines = format_tree(jedidb, "shapes.Circle", "    ", True, "up", visited, 1)
+        finally:
+            jedidb.close()
+        assert lines == [
+            "    `-- shapes.Circle",
+            "        `-- shapes.Shape",
+            "            `-- shapes.Mixin",
+        ]
+        assert visited == {"shapes.Base", "shapes.Circle", "shapes.Shape", "shapes.Mixin"}
+
+    def test_children_jsonl(self, class_project):
+        """Test subclasses are written one JSON object per line."""
+        import json
+
+        result = runner.invoke(app, [
+            "-C", str(class_project), "inheritance", "Shape", "--children", "-f", "jsonl",
+        ])
+        assert result.exit_code == 0
+        rows = [json.loads(line) for line in result.output.splitlines()]
+        assert [r["full_name"] for r in rows] == ["shapes.Circle", "shapes.Square"]
+        assert rows[0]["file_path"] == "shapes.py"
@@ -0,0 +1,33 @@
+"""Tests for config module."""
+
+import os
+
+from jedidb.config import Config
+
+
+class TestConfig:
+    """Tests for loading config.toml."""
+
+    def test_load_missing(self, temp_dir):
+        """Test a missing config.toml gives empty patterns."""
+        config = Config.load(temp_dir)
+        assert config.include_patterns == []
+        assert config.exclude_patterns == []
+
+    def test_load_reparses_edited_file(self, temp_dir):
+        """Test repeated loads are served from the cache until the file changes."""
+        config_file = temp_dir / "config.toml"
+        config_file.write_text('include = ["src/"]\n')
+        first = Config.load(temp_dir)
+        assert first.include_patterns == ["src/"]
+
+        # Loads return independent lists even when served from the cache
+        first.include_patterns.append("other/")
+        assert Config.load(temp_dir).include_patterns == ["src/"]
+
+        config_file.write_text('include = ["lib/"]\nexclude = ["test_"]\n')
+        st = os.stat(config_file)
+        os.utime(config_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        config = Config.load(temp_dir)
+        assert config.include_patterns == ["lib/"]
+        assert config.exclude_patterns == ["test_"]
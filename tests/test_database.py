@@ -135,6 +135,54 @@ class TestDatabase:
         assert temp_db.execute("SELECT COUNT(*) FROM refs").fetchone()[0] == 0
         assert temp_db.execute("SELECT COUNT(*) FROM imports").fetchone()[0] == 0
 
+    def test_delete_files_batch(self, temp_db):
+        """Test deleting several files at once keeps unrelated records."""
+        ids = [
+            temp_db.insert_file(FileRecord(path=f"f{i}.py", hash="abc", size=1))
+            for i in range(3)
+        ]
+        for file_id in ids:
+            temp_db.insert_definition(
+                Definition(file_id=file_id, name="func", type="function", line=1, column=0)
+            )
+
+        temp_db.delete_files(ids[:2])
+
+        assert temp_db.execute("SELECT path FROM files").fetchall() == [("f2.py",)]
+        assert temp_db.execute("SELECT COUNT(*) FROM definitions").fetchone()[0] == 1
+
+    def test_delete_files_by_paths(self, temp_db):
+        """Test path-based batch deletion, clearing tables when all files match."""
+        for path in ("a.py", "b.py"):
+            file_id = temp_db.insert_file(FileRecord(path=path, hash="abc", size=1))
+            temp_db.insert_definition(
+                Definition(file_id=file_id, name="func", type="function", line=1, column=0)
+            )
+
+        temp_db.delete_files_by_paths(["a.py", "missing.py"])
+        assert temp_db.execute("SELECT path FROM files").fetchall() == [("b.py",)]
+
+        temp_db.delete_files_by_paths(["b.py"])
+        assert temp_db.execute("SELECT COUNT(*) FROM files").fetchone()[0] == 0
+        assert temp_db.execute("SELECT COUNT(*) FROM definitions").fetchone()[0] == 0
+
+    def test_delete_missing_files(self, temp_db):
+        """Test anti-join deletion of files missing from disk."""
+        keep_id = temp_db.insert_file(FileRecord(path="keep.py", hash="abc", size=1))
+        gone_id = temp_db.insert_file(FileRecord(path="pkg/gone.py", hash="abc", size=1))
+        for file_id in (keep_id, gone_id):
+            temp_db.insert_definition(
+                Definition(file_id=file_id, name="func", type="function", line=1, column=0)
+            )
+            temp_db.insert_imports_batch([Import(file_id=file_id, module="os", line=1)])
+
+        assert temp_db.delete_missing_files(["keep.py"]) == ["pkg/gone.py"]
+        assert temp_db.execute("SELECT COUNT(*) FROM definitions").fetchone()[0] == 1
+        assert temp_db.execute("SELECT COUNT(*) FROM imports").fetchone()[0] == 1
+
+        assert temp_db.delete_missing_files([]) == ["keep.py"]
+        assert temp_db.execute("SELECT COUNT(*) FROM definitions").fetchone()[0] == 0
+
     def test_get_stats(self, temp_db):
         """Test getting database statistics."""
         # Add some data
@@ -0,0 +1,213 @@
+"""Tests for CLI output formatters."""
+
+import io
+import json
+from datetime import datetime
+
+import duckdb
+
+from jedidb.cli import formatters
+from jedidb.cli.formatters import (
+    PrefetchedResult,
+    format_data_json,
+    format_data_jsonl,
+    get_stderr_console,
+    is_terminal,
+    write_data_csv,
+    write_data_json,
+    write_data_jsonl,
+)
+
+
+class TestFormatters:
+    """Tests for JSON output formatting."""
+
+    ROWS = [
+        {"name": "func", "line": 3, "doc": None, "indexed_at": datetime(2024, 1, 2, 3, 4, 5)},
+        {"name": 'say "hi"', "line": 10, "tags": ["a", "b"], "score": 1.5},
+    ]
+
+    def test_json_matches_stdlib(self):
+        """Test pretty JSON output is the same with or without orjson."""
+        assert format_data_json(self.ROWS) == json.dumps(self.ROWS, indent=2, default=str)
+
+    def test_json_without_orjson(self, monkeypatch):
+        """Test the stdlib fallback is used when orjson is not installed."""
+        monkeypatch.setattr(formatters, "orjson", None)
+        assert format_data_json(self.ROWS) == json.dumps(self.ROWS, indent=2, default=str)
+
+    def test_jsonl_matches_stdlib(self):
+        """Test JSONL output is compact and one row per line."""
+        expected = "\n".join(
+            json.dumps(row, separators=(",", ":"), default=str) for row in self.ROWS
+        )
+        assert format_data_jsonl(self.ROWS) == expected
+        assert format_data_jsonl([]) == ""
+
+    def test_json_beyond_orjson(self):
+        """Test >64-bit ints and non-ASCII text still match the stdlib encoder."""
+        rows = [{"big": 2**80, "name": "caf\u00e9"}, {"big": -(2**70), "name": "x"}]
+        assert format_data_json(rows) == json.dumps(rows, indent=2, default=str)
+        assert format_data_jsonl(rows) == "\n".join(
+            json.dumps(row, separators=(",", ":"), default=str) for row in rows
+        )
+        assert format_data_json(rows).isascii()
+
+    def test_non_ascii_escaped(self):
+        """Test non-ASCII text is escaped like the stdlib, including surrogate pairs."""
+        rows = [{"name": "caf\u00e9 \u20ac \U0001f600", "note": 'a "\u00fc" \\ b\n'}]
+        assert format_data_json(rows) == json.dumps(rows, indent=2, default=str)
+        assert format_data_jsonl(rows) == json.dumps(rows[0], separators=(",", ":"))
+
+    def test_stderr_console_is_shared(self, monkeypatch):
+        """Test one Rich console is reused and writes to the current stderr."""
+        assert get_stderr_console() is get_stderr_console()
+
+        fake_stderr = io.StringIO()
+        monkeypatch.setattr("sys.stderr", fake_stderr)
+        get_stderr_console().print("hello")
+        assert "hello" in fake_stderr.getvalue()
+
+    def test_is_terminal_per_stream(self):
+        """Test the terminal check is cached per stream, not globally."""
+        class Stream(io.StringIO):
+            checks = 0
+
+            def isatty(self):
+                Stream.checks += 1
+                return True
+
+        tty = Stream()
+        assert is_terminal(tty) and is_terminal(tty)
+        assert Stream.checks == 1
+        assert not is_terminal(io.StringIO())
+
+class TestStreamingWriters:
+    """Tests for writers that stream DuckDB results in batches."""
+
+    SQL = "SELECT i AS id, 'name, ' || i AS name FROM range(5) t(i) ORDER BY i"
+
+    def test_write_data_json_matches_format(self, monkeypatch):
+        """Test streamed JSON has the same layout as format_data_json."""
+        monkeypatch.setattr(formatters, "FETCH_BATCH_SIZE", 2)
+        conn = duckdb.connect()
+        expected = [dict(zip(["id", "name"], row)) for row in conn.execute(self.SQL).fetchall()]
+
+        fh = io.StringIO()
+        assert write_data_json(fh, ["id", "name"], conn.execute(self.SQL)) == 5
+        assert fh.getvalue() == format_data_json(expected) + "\n"
+
+        fh = io.StringIO()
+        assert write_data_json(fh, ["id"], conn.execute("SELECT 1 WHERE false")) == 0
+        assert fh.getvalue() == "[]\n"
+
+    def test_write_data_json_binary_stream(self, monkeypatch):
+        """Test orjson bytes written to a UTF-8 buffer match the text path."""
+        monkeypatch.setattr(formatters, "FETCH_BATCH_SIZE", 2)
+        conn = duckdb.connect()
+
+        text = io.StringIO()
+        monkeypatch.setattr(formatters, "orjson", None)
+        write_data_json(text, ["id", "name"], conn.execute(self.SQL))
+        monkeypatch.undo()
+        monkeypatch.setattr(formatters, "FETCH_BATCH_SIZE", 2)
+
+        raw = io.BytesIO()
+        fh = io.TextIOWrapper(raw, encoding="utf-8")
+        fh.write("before\n")
+        assert write_data_json(fh, ["id", "name"], conn.execute(self.SQL)) == 5
+        fh.flush()
+        assert raw.getvalue().decode() == "before\n" + text.getvalue()
+
+    def test_write_data_csv(self, monkeypatch):
+        """Test streamed CSV writes a header and quotes values."""
+        monkeypatch.setattr(formatters, "FETCH_BATCH_SIZE", 2)
+        conn = duckdb.connect()
+
+        fh = io.StringIO(newline="")
+        assert write_data_csv(fh, ["id", "name"], conn.execute(self.SQL)) == 5
+        lines = fh.getvalue().splitlines()
+        assert lines[0] == "id,name"
+        assert lines[1] == '0,"name, 0"'
+        assert len(lines) == 6
+
+    def test_write_data_csv_one_write_per_batch(self, monkeypatch):
+        """Test CSV rows reach the stream in one write per batch."""
+        monkeypatch.setattr(formatters, "FETCH_BATCH_SIZE", 2)
+        conn = duckdb.connect()
+
+        class CountingStream(io.StringIO):
+            writes = 0
+
+            def write(self, s):
+                CountingStream.writes += 1
+                return super().write(s)
+
+        fh = CountingStream(newline="")
+        assert write_data_csv(fh, ["id", "name"], conn.execute(self.SQL)) == 5
+        assert CountingStream.writes == 3
+        assert fh.getvalue().splitlines()[0] == "id,name"
+
+        fh = io.StringIO(newline="")
+        assert write_data_csv(fh, ["id"], conn.execute("SELECT 1 WHERE false")) == 0
+        assert fh.getvalue() == "id\r\n"
+
+    def test_write_data_jsonl_prefetched(self, monkeypatch):
+        """Test JSONL streams every batch, including one fetched up front."""
+        monkeypatch.setattr(formatters, "FETCH_BATCH_SIZE", 2)
+        conn = duckdb.connect()
+        expected = [dict(zip(["id", "name"], row)) for row in conn.execute(self.SQL).fetchall()]
+
+        result = PrefetchedResult(conn.execute(self.SQL), size=2)
+        assert result.has_rows
+        fh = io.StringIO()
+        assert write_data_jsonl(fh, ["id", "name"], result) == 5
+        assert fh.getvalue() == format_data_jsonl(expected) + "\n"
+
+        assert not PrefetchedResult(conn.execute("SELECT 1 WHERE false")).has_rows
+        expected = conn.execute(self.SQL).fetchall()
+        assert PrefetchedResult(conn.execute(self.SQL), size=2).fetchall() == expected
+
+    def test_write_data_jsonl_binary_stream(self, monkeypatch):
+        """Test JSONL bytes written to a UTF-8 buffer match the text path."""
+        monkeypatch.setattr(formatters, "FETCH_BATCH_SIZE", 2)
+        conn = duckdb.connect()
+
+        text = io.StringIO()
+        monkeypatch.setattr(formatters, "orjson", None)
+        write_data_jsonl(text, ["id", "name"], conn.execute(self.SQL))
+        monkeypatch.undo()
+        monkeypatch.setattr(formatters, "FETCH_BATCH_SIZE", 2)
+
+        raw = io.BytesIO()
+        fh = io.TextIOWrapper(raw, encoding="utf-8")
+        fh.write("before\n")
+        assert write_data_jsonl(fh, ["id", "name"], conn.execute(self.SQL)) == 5
+        fh.flush()
+        assert raw.getvalue().decode() == "before\n" + text.getvalue()
+
+    def test_binary_streams_fall_back_per_batch(self, monkeypatch):
+        """Test a batch orjson cannot encode is streamed by the stdlib instead."""
+        monkeypatch.setattr(formatters, "FETCH_BATCH_SIZE", 2)
+        conn = duckdb.connect()
+        sql = (
+            "SELECT i AS id, CASE WHEN i = 3 THEN 2::HUGEINT << 80 ELSE i END AS big,"
+            " 'caf\u00e9' AS name FROM range(5) t(i) ORDER BY i"
+        )
+        expected = [dict(zip(["id", "big", "name"], row)) for row in conn.execute(sql).fetchall()]
+
+        for writer in (write_data_json, write_data_jsonl):
+            raw = io.BytesIO()
+            fh = io.TextIOWrapper(raw, encoding="utf-8")
+            assert writer(fh, ["id", "big", "name"], conn.execute(sql)) == 5
+            fh.flush()
+            text = raw.getvalue().decode()
+            if writer is write_data_json:
+                assert json.loads(text) == expected
+                assert text == json.dumps(expected, indent=2) + "\n"
+            else:
+                assert [json.loads(line) for line in text.splitlines()] == expected
+                lines = [json.dumps(row, separators=(",", ":")) for row in expected]
+                assert text == "\n".join(lines) + "\n"
+            # The stdlib batch and the orjson batches escape text alike
+            assert "caf\\u00e9" in text
@@ -6,6 +6,15 @@ from pathlib import Path
 from jedidb.core.indexer import Indexer
 from jedidb.core.database import Database
 from jedidb.core.analyzer import Analyzer
+from jedidb.utils import (
+    compile_file_patterns,
+    compile_patterns,
+    discover_python_files,
+    expand_patterns,
+    glob_match,
+    normalize_path,
+    normalize_paths,
+)
 
 
 class TestIndexer:
@@ -46,6 +55,57 @@ class TestIndexer:
         assert stats2["files_indexed"] == 0
         assert stats2["files_skipped"] == 1
 
+    def test_index_discovers_once(self, temp_db, sample_project, monkeypatch):
+        """Test an unchanged re-index reuses one discovery for the staleness check."""
+        from jedidb.core import indexer as indexer_module
+
+        indexer = Indexer(temp_db, Analyzer(project_path=sample_project))
+        indexer.index(base_path=sample_project)
+
+        calls = []
+        discover = indexer_module.discover_files
+
+        def counting_discover(*args, **kwargs):
+            calls.append(args)
+            return discover(*args, **kwargs)
+
+        monkeypatch.setattr(indexer_module, "discover_files", counting_discover)
+        stats = indexer.index(base_path=sample_project)
+
+        assert stats["index_skipped"]
+        assert len(calls) == 1
+
+    def test_index_prediscovered_files(self, temp_db, sample_project, monkeypatch):
+        """Test files discovered by the caller are indexed without walking again."""
+        from jedidb.core import indexer as indexer_module
+        from jedidb.utils import discover_files
+
+        files = discover_files(None, None, None, sample_project)
+
+        def fail_discover(*args, **kwargs):
+            raise AssertionError("discovery should be skipped")
+
+        monkeypatch.setattr(indexer_module, "discover_files", fail_discover)
+        indexer = Indexer(temp_db, Analyzer(project_path=sample_project))
+        stats = indexer.index(base_path=sample_project, files=files)
+
+        assert stats["files_indexed"] == len(files) > 0
+
+    def test_vanished_file_keeps_records(self, temp_db, sample_project):
+        """Test a file that disappears after discovery keeps its indexed records."""
+        from jedidb.utils import discover_files
+
+        indexer = Indexer(temp_db, Analyzer(project_path=sample_project))
+        indexer.index(base_path=sample_project)
+
+        files = discover_files(None, None, None, sample_project)
+        (sample_project / "src" / "utils.py").unlink()
+        stats = indexer.index(base_path=sample_project, files=files, force=True)
+
+        assert [e["file"] for e in stats["errors"]] == [str(sample_project / "src" / "utils.py")]
+        assert stats["files_indexed"] == len(files) - 1
+        assert temp_db.get_file("src/utils.py") is not None
+
     def test_force_reindex(self, temp_db, sample_python_file, temp_dir):
         """Test force re-indexing."""
         analyzer = Analyzer(project_path=temp_dir)
@@ -160,3 +220,77 @@ class TestIndexer:
 
         # Should have recorded an error for the bad file
         assert len(stats["errors"]) > 0
+
+
+class TestPatterns:
+    """Tests for include/exclude pattern matching."""
+
+    def test_compiled_patterns_match_glob_match(self):
+        """Test the combined regex agrees with matching each pattern in turn."""
+        patterns = expand_patterns(["tests", "test_", "_test", "src/pkg/", "a?c.py", "**/build/**"])
+        paths = [
+            "tests/test_x.py",
+            "pkg/tests/mod.py",
+            "pkg/test_mod.py",
+            "mod_test.py",
+            "src/pkg/mod.py",
+            "abc.py",
+            "lib/abc.py",
+            "lib/abbc.py",
+            "build/out.py",
+            "src/main.py",
+        ]
+        combined = compile_patterns(patterns)
+        for path in paths:
+            expected = any(glob_match(path, p) for p in patterns)
+            assert (combined.fullmatch(path) is not None) == expected, path
+
+        assert compile_patterns([]) is None
+        assert compile_patterns(None) is None
+
+    def test_file_patterns_compiled_once(self):
+        """Test discovery patterns are expanded and compiled once per pattern set."""
+        include_re, exclude_re = compile_file_patterns(["src/"], ["test_"])
+        assert compile_file_patterns(["src/"], ["test_"]) == (include_re, exclude_re)
+        assert include_re.fullmatch("src/pkg/mod.py")
+        assert exclude_re.fullmatch("pkg/test_mod.py")
+        assert exclude_re.fullmatch("pkg/__pycache__/mod.py")
+
+        include_re, exclude_re = compile_file_patterns(None, None)
+        assert include_re is None
+        assert not exclude_re.fullmatch("pkg/mod.py")
+
+    def test_normalize_paths_matches_normalize_path(self, temp_dir):
+        """Test batch normalization agrees with normalizing each path."""
+        (temp_dir / "pkg").mkdir()
+        (temp_dir / "pkg" / "mod.py").write_text("x = 1\n")
+        (temp_dir / "link.py").symlink_to(temp_dir / "pkg" / "mod.py")
+        paths = [
+            temp_dir / "pkg" / "mod.py",
+            temp_dir / "pkg" / ".." / "pkg" / "mod.py",
+            temp_dir / "link.py",
+            temp_dir.parent / "elsewhere.py",
+        ]
+        assert normalize_paths(paths, temp_dir) == [normalize_path(p, temp_dir) for p in paths]
+
+    def test_discover_skips_default_excluded_dirs(self, temp_dir):
+        """Test discovery prunes default-excluded directories and applies patterns."""
+        for rel in [
+            "pkg/mod.py",
+            "pkg/test_mod.py",
+            "pkg/notes.txt",
+            ".git/hooks/hook.py",
+            "build/gen.py",
+            "pkg/__pycache__/mod.py",
+            "demo.egg-info/setup.py",
+            "src/deep/nested/leaf.py",
+        ]:
+            path = temp_dir / rel
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text("x = 1\n")
+
+        found = discover_python_files(temp_dir, exclude=["test_"])
+        assert [p.relative_to(temp_dir.resolve()).as_posix() for p in found] == [
+            "pkg/mod.py",
+            "src/deep/nested/leaf.py",
+        ]
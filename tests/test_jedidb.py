@@ -0,0 +1,121 @@
+"""Tests for the JediDB facade."""
+
+import os
+import subprocess
+import sys
+
+import duckdb
+import pytest
+
+from jedidb import JediDB
+from jedidb.core.database import Database
+
+
+class TestJediDB:
+    """Tests for opening and sharing JediDB instances."""
+
+    def test_open_readonly(self, indexed_jedidb, temp_dir):
+        """Test read-only open sees indexed data without building an indexer."""
+        db = JediDB.open_readonly(source=temp_dir, index=temp_dir / ".jedidb")
+        try:
+            assert db.search_engine.get_definition("SampleClass") is not None
+            assert "analyzer" not in db.__dict__
+            with pytest.raises(RuntimeError):
+                db.indexer
+        finally:
+            db.close()
+
+    def test_shared_database(self, indexed_jedidb, temp_dir):
+        """Test concurrent instances share one database until the last closes."""
+        index = temp_dir / ".jedidb"
+        first = JediDB.open_readonly(source=temp_dir, index=index)
+        second = JediDB.open_readonly(source=temp_dir, index=index)
+        assert first.db is second.db
+        assert first.db.db_path.name == "jedidb.duckdb"
+        with pytest.raises(duckdb.Error):
+            first.db.execute("DELETE FROM files")
+
+        first.close()
+        assert second.search_engine.get_definition("SampleClass") is not None
+        second.close()
+
+    def test_check_staleness_readonly(self, indexed_jedidb, temp_dir):
+        """Test a read-only instance reports staleness without an indexer."""
+        db = JediDB.open_readonly(source=temp_dir, index=temp_dir / ".jedidb")
+        try:
+            assert db.check_staleness()["is_stale"] is False
+
+            (temp_dir / "sample.py").write_text("X = 1\n")
+            (temp_dir / "extra.py").write_text("Y = 2\n")
+            staleness = db.check_staleness()
+            assert staleness["changed"] == ["sample.py"]
+            assert staleness["added"] == ["extra.py"]
+            assert staleness["removed"] == []
+            assert "analyzer" not in db.__dict__
+        finally:
+            db.close()
+
+    def test_import_does_not_load_jedi(self):
+        """Test that importing jedidb defers the Jedi import until indexing."""
+        code = "import sys, jedidb; print('jedi' in sys.modules)"
+        env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True, env=env
+        )
+        assert result.stdout.strip() == "False"
+
+    def test_help_does_not_load_duckdb(self):
+        """Test that importing jedidb and listing CLI help skip DuckDB and the models."""
+        code = (
+            "import sys, jedidb\n"
+            "from jedidb.cli.app import app\n"
+            "sys.argv = ['jedidb', '--help']\n"
+            "try:\n"
+            "    app()\n"
+            "except SystemExit:\n"
+            "    pass\n"
+            "print('duckdb' in sys.modules, 'jedidb.core.models' in sys.modules, file=sys.stderr)\n"
+        )
+        env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True, env=env
+        )
+        assert "calls" in result.stdout
+        assert result.stderr.strip() == "False False"
+
+    def test_lazy_exports(self):
+        """Test lazily loaded exports stay importable from the package."""
+        from jedidb import Analyzer, Indexer
+        from jedidb.core.analyzer import Analyzer as CoreAnalyzer
+
+        assert Analyzer is CoreAnalyzer
+        assert Indexer.__name__ == "Indexer"
+
+        from jedidb import Database
+        from jedidb import JediDB as Facade
+        from jedidb.api import JediDB as ApiJediDB
+
+        assert Facade is ApiJediDB
+        assert Database.__module__ == "jedidb.core.database"
+
+    def test_native_snapshot(self, indexed_jedidb, temp_dir):
+        """Test indexing writes a native snapshot that reopens with views."""
+        db_dir = temp_dir / ".jedidb" / "db"
+        assert (db_dir / "jedidb.duckdb").exists()
+
+        db = Database.open_native(db_dir / "jedidb.duckdb")
+        try:
+            names = {r[0] for r in db.execute("SELECT name FROM functions").fetchall()}
+            assert "sample_function" in names
+        finally:
+            db.close()
+
+    def test_snapshot_indexes(self, indexed_jedidb, temp_dir):
+        """Test read-only opens see the call and reference lookup indexes."""
+        db = JediDB.open_readonly(source=temp_dir, index=temp_dir / ".jedidb")
+        try:
+            rows = db.db.execute("SELECT index_name FROM duckdb_indexes()").fetchall()
+            names = {r[0] for r in rows}
+            assert {"idx_calls_caller_order", "idx_refs_target_full_name"} <= names
+        finally:
+            db.close()